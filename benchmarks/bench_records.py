@@ -0,0 +1,70 @@
+"""
+Compare WeatherData models with columnar batches on the ingest hot path
+
+Measures memory held per row after parsing a response, and the time to
+parse a body and bulk load it into DuckDB.
+
+Run from the repository root: python -m benchmarks.bench_records
+"""
+
+import argparse
+import gc
+import json
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Tuple
+
+from snowfall_data_extract.db import WeatherDatabase
+from snowfall_data_extract.noaa import parse_json_response, parse_response_columns
+
+from .bench_validation import best_of, make_rows
+
+
+def measure_memory(func: Callable[[], object]) -> Tuple[int, int]:
+    """Return bytes still allocated by func's result, and the peak while running it"""
+    gc.collect()
+    tracemalloc.start()
+    result = func()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=16_500, help="Rows per response")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case")
+    args = parser.parse_args()
+
+    body = json.dumps(make_rows(args.rows)).encode()
+
+    with (
+        tempfile.TemporaryDirectory() as tmp,
+        WeatherDatabase(Path(tmp) / "bench.duckdb") as db,
+    ):
+        cases = {
+            "models": (
+                lambda: parse_json_response(body)[0],
+                lambda: db.upsert_weather_data(parse_json_response(body)[0]),
+            ),
+            "columns": (
+                lambda: parse_response_columns(body)[0],
+                lambda: db.upsert_weather_columns(parse_response_columns(body)[0]),
+            ),
+        }
+
+        print(f"{args.rows} rows, best of {args.repeat}")
+        for name, (parse, load) in cases.items():
+            current, peak = measure_memory(parse)
+            seconds = best_of(args.repeat, load)
+            print(
+                f"{name:<8} held {current / args.rows:6.0f} B/row  "
+                f"peak {peak / args.rows:6.0f} B/row  "
+                f"parse+load {seconds * 1000:7.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Compare per-row WeatherData validation with the batch and columnar paths
+
+The batch path (one TypeAdapter call building WeatherData models) is only
+about 1.2x faster than the per-row loop, short of the several-times goal.
+The columnar path used for ingest (validate_weather_columns, no models)
+reaches about 4-5x on validation and 3x from raw body to validated data.
+The synthetic rows repeat values more than real responses, which flatters
+the columnar path's handling of repeated decimals somewhat.
+
+Run from the repository root: python -m benchmarks.bench_validation
+"""
+
+import argparse
+import json
+import time
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List
+
+from snowfall_data_extract.noaa import (
+    WeatherData,
+    parse_json_response,
+    parse_response_columns,
+    validate_weather_columns,
+    validate_weather_data,
+    weather_data_columns,
+)
+
+
+def make_rows(count: int) -> List[Dict[str, Any]]:
+    """Build rows shaped like a daily-summaries JSON response"""
+    start = date(1980, 1, 1)
+    return [
+        {
+            "STATION": "USC00041072",
+            "NAME": "BIG BEAR LAKE, CA US",
+            "LATITUDE": "34.2433",
+            "LONGITUDE": "-116.8925",
+            "ELEVATION": "2060.4",
+            "DATE": (start + timedelta(days=i)).isoformat(),
+            "PRCP": f"{i % 7 * 0.13:.2f}",
+            "PRCP_ATTRIBUTES": ",,7,0700",
+            "SNOW": f"{i % 5 * 0.4:.1f}",
+            "SNOW_ATTRIBUTES": ",,7,",
+            "SNWD": f"{i % 11:.1f}",
+            "SNWD_ATTRIBUTES": ",,7,",
+            "TMAX": str(20 + i % 40),
+            "TMAX_ATTRIBUTES": ",,7,0700",
+            "TMIN": str(-10 + i % 30),
+            "TMIN_ATTRIBUTES": ",,7,0700",
+        }
+        for i in range(count)
+    ]
+
+
+def best_of(repeat: int, func: Callable[[], object]) -> float:
+    """Return the fastest of several timed runs, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=16_500, help="Rows per response")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    body = json.dumps(rows).encode()
+
+    models = [WeatherData.model_validate(r) for r in rows]
+    assert validate_weather_data(rows) == models
+    assert validate_weather_columns(rows) == weather_data_columns(models)
+
+    comparisons = {
+        "validation only": (
+            lambda: [WeatherData.model_validate(r) for r in rows],
+            lambda: validate_weather_data(rows),
+            lambda: validate_weather_columns(rows),
+        ),
+        "body to data": (
+            lambda: [WeatherData.model_validate(r) for r in json.loads(body)],
+            lambda: parse_json_response(body),
+            lambda: parse_response_columns(body),
+        ),
+    }
+
+    print(f"{args.rows} rows, best of {args.repeat}")
+    for name, (per_row, batch, columnar) in comparisons.items():
+        per_row_seconds = best_of(args.repeat, per_row)
+        batch_seconds = best_of(args.repeat, batch)
+        columnar_seconds = best_of(args.repeat, columnar)
+        print(
+            f"{name:<16} per-row {per_row_seconds * 1000:7.1f} ms  "
+            f"batch {batch_seconds * 1000:7.1f} ms "
+            f"({per_row_seconds / batch_seconds:4.2f}x)  "
+            f"columnar {columnar_seconds * 1000:7.1f} ms "
+            f"({per_row_seconds / columnar_seconds:4.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+# Comma-separated params whose order doesn't change the response
+_LIST_PARAMS = {"stations", "dataTypes"}
+
+
+def cache_key(params: Dict[str, Any]) -> str:
+    """
+    Hash request params into a cache key
+
+    Param order and the order of stations and data types don't matter, so
+    equivalent requests share one entry.
+
+    Args:
+        params: NOAA query parameters
+
+    Returns:
+        Hex digest identifying the request
+    """
+    normalized = {
+        name: ",".join(sorted(str(value).split(","))) if name in _LIST_PARAMS else str(value)
+        for name, value in params.items()
+    }
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True).encode()).hexdigest()
+
+
+class CacheEntry(BaseModel):
+    """Metadata stored next to a cached response body"""
+
+    params: Dict[str, str]
+    stored_at: float
+    expires_at: Optional[float] = None
+    size: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def is_fresh(self) -> bool:
+        """Whether the body can be used without asking NOAA again"""
+        return self.expires_at is None or time.time() < self.expires_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """Request headers asking NOAA to answer 304 if the body hasn't changed"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class CacheWriter:
+    """Compresses a response body into the cache as it arrives"""
+
+    def __init__(
+        self,
+        cache: "ResponseCache",
+        params: Dict[str, Any],
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ):
+        self.cache = cache
+        self.params = params
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body_path, self.meta_path = cache.paths(cache_key(params))
+        self.body_path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = self.body_path.with_suffix(f".{os.getpid()}.tmp")
+        self._file = gzip.open(self._tmp_path, "wb", compresslevel=6)
+        self._done = False
+
+    def write(self, chunk: bytes) -> None:
+        self._file.write(chunk)
+
+    def commit(self) -> None:
+        """Publish the body and its metadata"""
+        self._file.close()
+        os.replace(self._tmp_path, self.body_path)
+        self._done = True
+        size = self.body_path.stat().st_size
+        entry = CacheEntry(
+            params={name: str(value) for name, value in self.params.items()},
+            stored_at=time.time(),
+            size=size,
+            etag=self.etag,
+            last_modified=self.last_modified,
+        )
+        self.cache.write_entry(self.params, entry)
+        self.cache.added(size)
+
+    def discard(self) -> None:
+        """Drop a partially written body; does nothing after commit"""
+        if self._done:
+            return
+        self._file.close()
+        self._tmp_path.unlink(missing_ok=True)
+        self._done = True
+
+
+class ResponseCache:
+    """
+    On-disk cache of NOAA response bodies, keyed by normalized request params
+
+    Bodies are stored gzip-compressed. Windows that ended more than
+    settle_days ago are closed history and never expire; more recent windows
+    expire after recent_ttl seconds because NOAA still revises them. When the
+    cache grows past max_bytes the least recently used entries are removed.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int = 2_000_000_000,
+        recent_ttl: float = 6 * 60 * 60,
+        settle_days: int = 30,
+    ):
+        """
+        Initialize cache
+
+        Args:
+            cache_dir: Directory holding cached responses
+            max_bytes: Compressed size above which old entries are evicted
+            recent_ttl: Seconds a response covering recent dates stays fresh
+            settle_days: Age in days after which a window's data is final
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.recent_ttl = recent_ttl
+        self.settle_days = settle_days
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._size: int | None = None
+
+    def paths(self, key: str) -> Tuple[Path, Path]:
+        """Body and metadata paths of a cache key"""
+        directory = self.cache_dir / key[:2]
+        return directory / f"{key}.gz", directory / f"{key}.json"
+
+    def ttl(self, params: Dict[str, Any]) -> float | None:
+        """Seconds a response for these params stays fresh, None for never expiring"""
+        end_date = params.get("endDate")
+        if end_date is None:
+            return self.recent_ttl
+        settled = date.today() - timedelta(days=self.settle_days)
+        return None if date.fromisoformat(str(end_date)) < settled else self.recent_ttl
+
+    def lookup(self, params: Dict[str, Any]) -> Optional[CacheEntry]:
+        """
+        Get the metadata of a cached response, fresh or not
+
+        Args:
+            params: NOAA query parameters
+
+        Returns:
+            Cache entry, or None if nothing usable is cached
+        """
+        body_path, meta_path = self.paths(cache_key(params))
+        try:
+            entry = CacheEntry.model_validate_json(meta_path.read_bytes())
+        except (OSError, ValidationError):
+            return None
+        return entry if body_path.exists() else None
+
+    def write_entry(self, params: Dict[str, Any], entry: CacheEntry) -> None:
+        """Store an entry's metadata, starting its freshness lifetime now"""
+        ttl = self.ttl(params)
+        entry.stored_at = time.time()
+        entry.expires_at = None if ttl is None else entry.stored_at + ttl
+        _, meta_path = self.paths(cache_key(params))
+        meta_path.write_text(entry.model_dump_json())
+
+    def revalidate(self, params: Dict[str, Any]) -> Optional[bytes]:
+        """
+        Reuse a cached body after NOAA answered 304 Not Modified
+
+        Args:
+            params: NOAA query parameters
+
+        Returns:
+            Decompressed body, now fresh again, or None if it is no longer cached
+        """
+        entry = self.lookup(params)
+        body = self.read(params) if entry is not None else None
+        if entry is None or body is None:
+            return None
+        self.write_entry(params, entry)
+        self.revalidated += 1
+        return body
+
+    def read(self, params: Dict[str, Any]) -> Optional[bytes]:
+        """
+        Read a cached body regardless of freshness and mark it as recently used
+
+        Args:
+            params: NOAA query parameters
+
+        Returns:
+            Decompressed body, or None if it is missing or unreadable
+        """
+        body_path, _ = self.paths(cache_key(params))
+        try:
+            body = gzip.decompress(body_path.read_bytes())
+            os.utime(body_path)
+        except (OSError, EOFError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f"Ignoring unreadable cache entry {body_path}: {str(e)}")
+            return None
+        return body
+
+    def get(self, params: Dict[str, Any]) -> Optional[bytes]:
+        """
+        Get a fresh cached body
+
+        Args:
+            params: NOAA query parameters
+
+        Returns:
+            Decompressed body, or None on a miss or an expired entry
+        """
+        entry = self.lookup(params)
+        body = self.read(params) if entry is not None and entry.is_fresh() else None
+        if body is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return body
+
+    def writer(
+        self, params: Dict[str, Any], etag: str | None = None, last_modified: str | None = None
+    ) -> CacheWriter:
+        """Start writing a body for these params; call commit when it is complete"""
+        return CacheWriter(self, params, etag, last_modified)
+
+    def put(
+        self,
+        params: Dict[str, Any],
+        body: bytes,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """
+        Store a response body
+
+        Args:
+            params: NOAA query parameters
+            body: Raw response body
+            etag: ETag header of the response, if any
+            last_modified: Last-Modified header of the response, if any
+        """
+        writer = self.writer(params, etag, last_modified)
+        try:
+            writer.write(body)
+            writer.commit()
+        finally:
+            writer.discard()
+
+    def added(self, size: int) -> None:
+        """Account for a newly stored body and evict if the cache is too large"""
+        if self._size is None:
+            self._size = sum(path.stat().st_size for path in self._bodies())
+        else:
+            self._size += size
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _bodies(self) -> List[Path]:
+        return list(self.cache_dir.glob("*/*.gz"))
+
+    def _evict(self) -> None:
+        """Remove least recently used bodies until the cache fits in max_bytes"""
+        bodies = []
+        for path in self._bodies():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            bodies.append((stat.st_mtime, stat.st_size, path))
+        bodies.sort()
+
+        size = sum(body_size for _, body_size, _ in bodies)
+        for _, body_size, path in bodies:
+            if size <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            path.with_suffix(".json").unlink(missing_ok=True)
+            size -= body_size
+            logger.debug(f"Evicted cached response {path.name}")
+        self._size = size
@@ -1,12 +1,33 @@
 #!/usr/bin/env python3
 import argparse
 import asyncio
+import contextlib
 import logging
+import os
+import signal
+import time
+from datetime import date, timedelta
 from pathlib import Path
 
-from .config import Config, load_config
-from .db import WeatherDatabase
-from .noaa import NOAAClient
+from .cache import ResponseCache
+from .config import Config, ConfigWatcher, load_config
+from .daemon import SNOW_SEASON_MONTHS, IngestDaemon, RefreshSchedule
+from .db import JobRecord, WeatherDatabase
+from .export import ParquetExporter
+from .noaa import (
+    AdaptiveRateLimit,
+    NOAAClient,
+    RateLimit,
+    TransportSettings,
+    WeatherColumns,
+    column_rows,
+    first_dates,
+    split_date_range,
+    weather_data_columns,
+)
+from .pipeline import FetchJob, IngestPipeline, format_stats
+from .scheduler import StationScheduler, format_summary, oldest_first
+from .writer import DatabaseWriter
 
 # Configure logging
 logging.basicConfig(
@@ -15,45 +36,167 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-async def fetch_station_data(
+def print_sample(station_id: str, columns: WeatherColumns) -> None:
+    """Print the first few records of a station for debugging"""
+    print(f"\nSample data for {station_id}:")
+    for i in range(min(5, column_rows(columns))):  # Show first 5 records
+        print(f"Date: {columns['date'][i]}")
+        print(f"Snowfall: {columns['snowfall'][i] or 'N/A'}")
+        print(f"Snow Depth: {columns['snow_depth'][i] or 'N/A'}")
+        print(f"Temp Max: {columns['temp_max'][i] or 'N/A'}")
+        print(f"Temp Min: {columns['temp_min'][i] or 'N/A'}")
+        print("-" * 40)
+
+
+async def stream_station_job(
     station_id: str,
+    start_date: date,
+    end_date: date,
     client: NOAAClient,
-    db: WeatherDatabase,
-    config: Config,
+    writer: DatabaseWriter,
+    debug: bool = False,
+) -> tuple[int, date | None]:
+    """
+    Stream one station window and store each batch as it arrives
+
+    Returns:
+        Number of records, and the earliest date among them
+    """
+    station_stored = False
+    total = 0
+    first_date: date | None = None
+    async for weather_data, station_info in client.stream_station_data(
+        station_id, start_date, end_date
+    ):
+        await writer.write(None if station_stored else station_info, weather_data)
+        station_stored = station_stored or station_info is not None
+        if debug and total == 0:
+            print_sample(station_id, weather_data_columns(weather_data[:5]))
+        total += len(weather_data)
+        batch_first = min((record.date for record in weather_data), default=None)
+        if batch_first is not None and (first_date is None or batch_first < first_date):
+            first_date = batch_first
+    return total, first_date
+
+
+async def fetch_station_jobs(
+    station_id: str,
+    jobs: list[FetchJob],
+    client: NOAAClient,
+    writer: DatabaseWriter,
     debug: bool = False,
+    stream: bool = False,
 ) -> None:
-    """Fetch and store data for a single station"""
-    try:
-        config = load_config()
-        logger.info(f"Fetching data for station {station_id}...")
-        weather_data, station_info = await client.get_station_data(
-            station_id, config.stations.start_date, config.stations.end_date
-        )
+    """
+    Fetch and store a station's jobs, recording each in the job ledger
 
-        if station_info:
-            db.upsert_station(station_info)
-            logger.info(f"Upserted station info for {station_id}")
-
-        if weather_data:
-            db.upsert_weather_data(weather_data)
-            logger.info(f"Upserted {len(weather_data)} records for {station_id}")
-
-            if debug:
-                print(f"\nSample data for {station_id}:")
-                for record in weather_data[:5]:  # Show first 5 records
-                    print(f"Date: {record.date}")
-                    print(f"Snowfall: {record.snowfall or 'N/A'}")
-                    print(f"Snow Depth: {record.snow_depth or 'N/A'}")
-                    print(f"Temp Max: {record.temp_max or 'N/A'}")
-                    print(f"Temp Min: {record.temp_min or 'N/A'}")
-                    print("-" * 40)
+    Jobs run concurrently and each is written as it completes, marked done
+    in the same transaction as its data, so a crash only loses the jobs in
+    flight. A failed job is recorded as failed and fails the station once
+    the others have finished.
+    """
+    if not jobs:
+        logger.info(f"Station {station_id} is up to date")
         return
-    except Exception as e:
-        logger.error(f"Error processing station {station_id}: {str(e)}", exc_info=True)
-        raise
+    logger.info(f"Fetching data for station {station_id} ({len(jobs)} job(s))...")
 
+    async def fetch(start_date: date, end_date: date) -> int:
+        record = JobRecord(station_ids=[station_id], start_date=start_date, end_date=end_date)
+        started = time.perf_counter()
+        try:
+            if stream:
+                rows, first_date = await stream_station_job(
+                    station_id, start_date, end_date, client, writer, debug
+                )
+                record.duration = time.perf_counter() - started
+                if first_date is not None:
+                    record.first_dates = {station_id: first_date}
+                # Queued after the job's batches, so it commits with or after them
+                await writer.record_jobs([record])
+                return rows
 
-def main() -> None:
+            columns, station_info = await client.get_station_columns(
+                station_id, start_date, end_date
+            )
+            record.duration = time.perf_counter() - started
+            record.first_dates = first_dates(columns)
+            await writer.write_columns(
+                [station_info] if station_info else [], columns, [record]
+            )
+            if debug and column_rows(columns):
+                print_sample(station_id, columns)
+            return column_rows(columns)
+        except Exception as e:
+            record.status = "failed"
+            record.error = str(e)
+            record.duration = time.perf_counter() - started
+            with contextlib.suppress(RuntimeError):  # the writer itself failed
+                await writer.record_jobs([record])
+            raise
+
+    results = await asyncio.gather(
+        *(fetch(start_date, end_date) for _, start_date, end_date in jobs),
+        return_exceptions=True,
+    )
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        logger.error(
+            f"Error processing station {station_id}: {len(errors)} of {len(jobs)} job(s) "
+            f"failed: {str(errors[0])}",
+            exc_info=errors[0],
+        )
+        raise errors[0]
+    logger.info(
+        f"Queued {sum(r for r in results if isinstance(r, int))} records for {station_id}"
+    )
+
+
+def build_jobs(
+    stations: list[str],
+    db: WeatherDatabase,
+    config: Config,
+    fetch_window: str | None = None,
+    incremental: bool = False,
+    refresh_days: int = 7,
+    fill_gaps: bool = False,
+    batch_size: int = 1,
+) -> list[FetchJob]:
+    """Turn stations into pipeline fetch jobs, one per station batch and date window"""
+    start_date, end_date = config.stations.start_date, config.stations.end_date
+    jobs: list[FetchJob] = []
+
+    if incremental:
+        groups = [
+            ([station_id], ranges)
+            for station_id in stations
+            if (
+                ranges := db.get_missing_ranges(
+                    station_id,
+                    start_date,
+                    end_date,
+                    refresh_days=refresh_days,
+                    fill_gaps=fill_gaps,
+                )
+            )
+        ]
+    else:
+        groups = [
+            (stations[i : i + batch_size], [(start_date, end_date)])
+            for i in range(0, len(stations), batch_size)
+        ]
+
+    for station_ids, ranges in groups:
+        for range_start, range_end in ranges:
+            windows = (
+                split_date_range(range_start, range_end, fetch_window)
+                if fetch_window
+                else [(range_start, range_end)]
+            )
+            jobs.extend((station_ids, s, e) for s, e in windows)
+    return jobs
+
+
+def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Snowfall Analytics CLI")
     parser.add_argument(
         "--station", help="Single station ID to fetch (defaults to config file)"
@@ -69,33 +212,442 @@ def main() -> None:
         default=None,
         required=False,
     )
+    parser.add_argument(
+        "--fetch-window",
+        help="Fetch each station in concurrent windows: water_year, year, month or N days",
+        default=None,
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only fetch dates missing from the database plus a recent refresh window",
+    )
+    parser.add_argument(
+        "--refresh-days",
+        type=int,
+        default=7,
+        help="Days before the end date to always refetch in incremental mode",
+    )
+    parser.add_argument(
+        "--fill-gaps",
+        action="store_true",
+        help="In incremental mode, also refetch holes between stored dates",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="Stations per NOAA request for full-range fetches, run as pipeline jobs",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Parse JSON responses incrementally and store them in batches to bound memory",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "csv"],
+        default="json",
+        help="NOAA response format; csv is smaller and parsed column by column",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=4,
+        help="Maximum number of stations fetched at the same time",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Run fetch, parse and load as separate stages and report per-stage throughput",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the last run with only the jobs that did not finish",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=None,
+        help="Processes used to parse responses in pipeline mode (default: one per CPU)",
+    )
+    parser.add_argument(
+        "--commit-rows",
+        type=int,
+        default=100_000,
+        help="Weather data rows the database writer groups into one transaction",
+    )
+    parser.add_argument(
+        "--storage",
+        choices=["table", "parquet"],
+        default="table",
+        help=(
+            "Store weather data in a DuckDB table, or as append-only Parquet files "
+            "in data/lake/ read through a view"
+        ),
+    )
+    parser.add_argument(
+        "--compact-files",
+        type=int,
+        default=16,
+        help="Parquet storage: merge the lake's files after a run once this many exist",
+    )
+    parser.add_argument(
+        "--export-parquet",
+        action="store_true",
+        help="Update the station/year partitioned Parquet export after each run or cycle",
+    )
+    parser.add_argument(
+        "--adaptive-rate",
+        action="store_true",
+        help="Learn the NOAA request rate and remember it in the data directory",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep running and refresh stations incrementally on a schedule",
+    )
+    parser.add_argument(
+        "--season-interval",
+        type=int,
+        default=60,
+        help="Minutes between refreshes of a station during snow season in daemon mode",
+    )
+    parser.add_argument(
+        "--off-season-interval",
+        type=int,
+        default=24 * 60,
+        help="Minutes between refreshes of a station outside snow season in daemon mode",
+    )
+    parser.add_argument(
+        "--season-months",
+        default=",".join(str(month) for month in SNOW_SEASON_MONTHS),
+        help="Comma-separated months (1-12) of the snow season",
+    )
+    parser.add_argument(
+        "--health-port",
+        type=int,
+        default=8765,
+        help="Localhost port of the daemon's /health status endpoint",
+    )
+    parser.add_argument(
+        "--no-http2",
+        action="store_true",
+        help="Use HTTP/1.1 connections instead of multiplexing requests over HTTP/2",
+    )
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        default=4,
+        help="Connections to NOAA kept open and shared by concurrent requests",
+    )
+    parser.add_argument(
+        "--connect-timeout",
+        type=float,
+        default=10.0,
+        help="Seconds to wait for a connection to NOAA",
+    )
+    parser.add_argument(
+        "--read-timeout",
+        type=float,
+        default=60.0,
+        help="Seconds to wait for NOAA to send response data",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always download from NOAA instead of reusing cached responses",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=2000,
+        help="Compressed size of the response cache before old entries are evicted",
+    )
 
     args = parser.parse_args()
+    # Reject flags the chosen mode would silently ignore
+    if args.batch_size > 1 and (args.incremental or args.daemon):
+        parser.error(
+            "--batch-size only applies to full-range runs, not --incremental or --daemon"
+        )
+    if args.stream and (args.pipeline or args.resume or args.batch_size > 1):
+        parser.error(
+            "--stream only applies to per-station runs, not --pipeline or --batch-size"
+        )
+    if args.stream and args.format != "json":
+        parser.error("--stream only supports --format json")
+    return args
+
+
+async def run_pipeline(
+    args: argparse.Namespace,
+    stations: list[str],
+    client: NOAAClient,
+    db: WeatherDatabase,
+    writer: DatabaseWriter,
+    config: Config,
+    fetch_window: str | None,
+) -> None:
+    """Fetch, parse and load all stations through the staged pipeline"""
+    if args.resume:
+        if not db.has_job_plan():
+            raise RuntimeError("No run to resume: the job ledger is empty")
+        jobs = db.get_unfinished_jobs()
+        logger.info(f"Resuming {len(jobs)} unfinished job(s) from the job ledger")
+    else:
+        jobs = build_jobs(
+            oldest_first(db.get_last_dates(stations)),
+            db,
+            config,
+            fetch_window,
+            args.incremental,
+            args.refresh_days,
+            args.fill_gaps,
+            args.batch_size,
+        )
+        db.plan_jobs(jobs)
+    pipeline = IngestPipeline(
+        client,
+        writer,
+        fetch_workers=args.max_in_flight,
+        parse_workers=args.parse_workers or os.cpu_count() or 1,
+    )
+    result = await pipeline.run(jobs)
+    print(format_stats(result.stats))
+    print(f"Pipeline finished in {result.elapsed:.1f}s")
+
+    if result.failed_jobs:
+        raise RuntimeError(f"Failed jobs: {', '.join(result.failed_jobs)}")
+
+
+async def run_stations(
+    args: argparse.Namespace,
+    stations: list[str],
+    client: NOAAClient,
+    db: WeatherDatabase,
+    writer: DatabaseWriter,
+    config: Config,
+    fetch_window: str | None,
+) -> None:
+    """Fetch and store each station as its own scheduled task"""
+    ordered = oldest_first(db.get_last_dates(stations))
+    jobs = build_jobs(
+        ordered,
+        db,
+        config,
+        fetch_window,
+        args.incremental,
+        args.refresh_days,
+        args.fill_gaps,
+    )
+    # Every (station, window) job is planned up front, so --resume can finish the run
+    db.plan_jobs(jobs)
+    station_jobs: dict[str, list[FetchJob]] = {station_id: [] for station_id in ordered}
+    for job in jobs:
+        station_jobs[job[0][0]].append(job)
+
+    async def fetch(station_id: str) -> None:
+        await fetch_station_jobs(
+            station_id, station_jobs[station_id], client, writer, args.debug, args.stream
+        )
+
+    scheduler = StationScheduler(args.max_in_flight)
+    results = await scheduler.run(ordered, fetch)
+    print(format_summary(results))
+
+    failed = [r.name for r in results if not r.succeeded]
+    if failed:
+        raise RuntimeError(f"Failed stations: {', '.join(failed)}")
+
+
+async def run(
+    args: argparse.Namespace,
+    stations: list[str],
+    db: WeatherDatabase,
+    config: Config,
+    fetch_window: str | None,
+    rate_limiter: RateLimit | None,
+) -> None:
+    """Run one extraction pass over the given stations"""
+    cache = open_cache(args, config)
+
+    async with (
+        NOAAClient(
+            rate_limiter=rate_limiter,
+            response_format=args.format,
+            cache=cache,
+            transport=transport_settings(args),
+        ) as client,
+        DatabaseWriter(
+            config.db_path, max_batch_rows=args.commit_rows, lake_dir=lake_dir(args, config)
+        ) as writer,
+    ):
+        try:
+            # Multi-station requests run as pipeline jobs, one per batch and window
+            if args.pipeline or args.resume or args.batch_size > 1:
+                await run_pipeline(args, stations, client, db, writer, config, fetch_window)
+            else:
+                await run_stations(args, stations, client, db, writer, config, fetch_window)
+        except Exception as e:
+            logger.error(f"Error in run: {str(e)}", exc_info=True)
+            raise
+        finally:
+            log_cache_stats(cache)
+
+
+async def run_daemon(
+    args: argparse.Namespace,
+    db: WeatherDatabase,
+    watcher: ConfigWatcher,
+    rate_limiter: RateLimit | None,
+) -> None:
+    """Keep the client and database open and refresh stations on a schedule"""
+    config = watcher.current()
+    # Recent windows are revalidated with NOAA on every refresh, which costs a 304 if unchanged
+    cache = open_cache(args, config, recent_ttl=0)
+    schedule = RefreshSchedule(
+        season_interval=timedelta(minutes=args.season_interval),
+        off_season_interval=timedelta(minutes=args.off_season_interval),
+        season_months=tuple(int(month) for month in args.season_months.split(",")),
+    )
+
+    def open_writer() -> DatabaseWriter:
+        writer = DatabaseWriter(
+            config.db_path, max_batch_rows=args.commit_rows, lake_dir=lake_dir(args, config)
+        )
+        writer.start()
+        return writer
+
+    async with NOAAClient(
+        rate_limiter=rate_limiter,
+        response_format=args.format,
+        cache=cache,
+        transport=transport_settings(args),
+    ) as client:
+        writer = open_writer()
+
+        async def refresh(station_id: str, config: Config) -> None:
+            # Refresh up to today, so the trailing refresh window covers recent data
+            today = date.today()
+            if config.stations.end_date > today:
+                stations = config.stations.model_copy(update={"end_date": today})
+                config = config.model_copy(update={"stations": stations})
+            jobs = build_jobs(
+                [station_id],
+                db,
+                config,
+                args.fetch_window or config.stations.fetch_window,
+                incremental=True,
+                refresh_days=args.refresh_days,
+                fill_gaps=args.fill_gaps,
+            )
+            await fetch_station_jobs(station_id, jobs, client, writer, args.debug, args.stream)
+
+        async def after_cycle() -> None:
+            nonlocal writer
+            if writer.failed:
+                # A failed writer rejects every later write. The rows it lost were never
+                # committed, so the failed stations' next refresh fetches them again.
+                logger.warning("Database writer failed, reopening it")
+                with contextlib.suppress(RuntimeError):
+                    await writer.close()
+                writer = open_writer()
+            if args.storage == "parquet" or args.export_parquet:
+                # Maintain what this cycle fetched, on the main connection outside the loop
+                await writer.flush()
+                await asyncio.to_thread(maintain_storage, args, db, config)
+
+        daemon = IngestDaemon(
+            watcher,
+            refresh,
+            schedule,
+            max_in_flight=args.max_in_flight,
+            stations=[args.station] if args.station else None,
+            after_cycle=after_cycle,
+        )
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            with contextlib.suppress(NotImplementedError):
+                loop.add_signal_handler(sig, daemon.stop)
+
+        try:
+            await daemon.serve(port=args.health_port)
+        finally:
+            log_cache_stats(cache)
+            await writer.close()
+
+
+def lake_dir(args: argparse.Namespace, config: Config) -> Path | None:
+    """Parquet lake directory when weather data is stored as Parquet files"""
+    return config.lake_dir if args.storage == "parquet" else None
+
+
+def maintain_storage(args: argparse.Namespace, db: WeatherDatabase, config: Config) -> None:
+    """Compact the Parquet lake and update the Parquet export, as configured"""
+    db.compact_weather_data(args.compact_files)
+    if args.export_parquet:
+        ParquetExporter(db, config.parquet_dir).export()
+
+
+def open_cache(
+    args: argparse.Namespace, config: Config, recent_ttl: float = 6 * 60 * 60
+) -> ResponseCache | None:
+    """Create the response cache unless it is disabled"""
+    if args.no_cache:
+        return None
+    return ResponseCache(
+        config.cache_dir, max_bytes=args.cache_max_mb * 1_000_000, recent_ttl=recent_ttl
+    )
+
+
+def transport_settings(args: argparse.Namespace) -> TransportSettings:
+    """Build NOAA connection settings from the command line"""
+    return TransportSettings(
+        http2=not args.no_http2,
+        max_connections=args.max_connections,
+        max_keepalive_connections=args.max_connections,
+        connect_timeout=args.connect_timeout,
+        read_timeout=args.read_timeout,
+    )
+
+
+def log_cache_stats(cache: ResponseCache | None) -> None:
+    if cache is not None:
+        logger.info(
+            f"Response cache: {cache.hits} hits, {cache.revalidated} not modified, "
+            f"{cache.misses - cache.revalidated} downloads"
+        )
+
+
+def main() -> None:
+    args = parse_args()
 
     try:
-        config = load_config(data_dir=args.data_dir)
-        stations = [args.station] if args.station else config.stations.stations
+        config = load_config(data_dir=args.data_dir, config_path=args.config)
+        stations = [args.station] if args.station else list(config.stations.stations)
+        fetch_window = args.fetch_window or config.stations.fetch_window
 
         if not stations:
             logger.error("No stations specified in config or command line")
             exit(1)
 
-        with WeatherDatabase(config.db_path) as db:
-
-            async def run() -> None:
-                async with NOAAClient() as client:
-                    try:
-                        await asyncio.gather(
-                            *(
-                                fetch_station_data(s, client, db, config, args.debug)
-                                for s in stations
-                            )
-                        )
-                    except Exception as e:
-                        logger.error(f"Error in run: {str(e)}", exc_info=True)
-                        raise
-
-            asyncio.run(run())
+        with WeatherDatabase(config.db_path, lake_dir=lake_dir(args, config)) as db:
+            rate_limiter: RateLimit | None = None
+            if args.adaptive_rate:
+                rate_limiter = AdaptiveRateLimit.load(config.rate_limit_path)
+
+            try:
+                if args.daemon:
+                    watcher = ConfigWatcher(args.data_dir, args.config)
+                    asyncio.run(run_daemon(args, db, watcher, rate_limiter))
+                else:
+                    asyncio.run(run(args, stations, db, config, fetch_window, rate_limiter))
+                    maintain_storage(args, db, config)
+            finally:
+                if isinstance(rate_limiter, AdaptiveRateLimit):
+                    rate_limiter.save(config.rate_limit_path)
 
         logger.info("Data fetch completed successfully")
 
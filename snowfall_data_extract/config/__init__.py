@@ -1,4 +1,4 @@
-from .loader import load_config
+from .loader import ConfigWatcher, load_config
 from .models import Config, StationConfig
 
-__all__ = ["Config", "StationConfig", "load_config"]
+__all__ = ["Config", "ConfigWatcher", "StationConfig", "load_config"]
@@ -1,8 +1,15 @@
 import json
+import logging
 from pathlib import Path
 
 from .models import Config, StationConfig
 
+logger = logging.getLogger(__name__)
+
+
+def _resolve_config_path(data_dir: Path, config_path: Path | str | None) -> Path:
+    return data_dir / "config.json" if config_path is None else Path(config_path)
+
 
 def load_config(
     data_dir: Path | str = "data", config_path: Path | str | None = None
@@ -13,10 +20,7 @@ def load_config(
     data_dir = Path(data_dir)
     data_dir.mkdir(parents=True, exist_ok=True)
 
-    if config_path is None:
-        resolved_config_path = data_dir / "config.json"
-    else:
-        resolved_config_path = Path(config_path)
+    resolved_config_path = _resolve_config_path(data_dir, config_path)
 
     with open(resolved_config_path) as f:
         raw_config = json.load(f)
@@ -26,3 +30,43 @@ def load_config(
     config = Config(data_dir=data_dir, stations=stations_config)
 
     return config
+
+
+class ConfigWatcher:
+    """
+    Config snapshot that is reloaded when the config file changes
+
+    For long-running modes: current() only stats the file, and parses it
+    again only after its modification time moved. A file that fails to load
+    is logged and the previous snapshot stays in use.
+    """
+
+    def __init__(self, data_dir: Path | str = "data", config_path: Path | str | None = None):
+        """
+        Load the initial config
+
+        Args:
+            data_dir: Directory for storing the database and other data files
+            config_path: Path to config file (defaults to data_dir/config.json)
+        """
+        self.data_dir = Path(data_dir)
+        self.config_path = _resolve_config_path(self.data_dir, config_path)
+        self._mtime = self.config_path.stat().st_mtime_ns
+        self._config = load_config(self.data_dir, self.config_path)
+
+    def current(self) -> Config:
+        """
+        Get the latest config, reloading it if the file was modified
+
+        Returns:
+            The current config snapshot
+        """
+        try:
+            mtime = self.config_path.stat().st_mtime_ns
+            if mtime != self._mtime:
+                self._config = load_config(self.data_dir, self.config_path)
+                self._mtime = mtime
+                logger.info(f"Reloaded config from {self.config_path}")
+        except Exception as e:
+            logger.error(f"Keeping previous config, failed to reload: {str(e)}")
+        return self._config
@@ -1,20 +1,36 @@
 from datetime import date
 from pathlib import Path
-from typing import List
+from typing import Optional, Tuple
 
-from pydantic import BaseModel, DirectoryPath, Field
+from pydantic import BaseModel, ConfigDict, DirectoryPath, Field
 
 
 class StationConfig(BaseModel):
     """Config for weather stations to collect data from"""
 
-    stations: List[str] = Field(description="List of NOAA station IDs")
+    model_config = ConfigDict(frozen=True)
+
+    stations: Tuple[str, ...] = Field(description="List of NOAA station IDs")
     start_date: date = Field(description="Start date for data collection")
     end_date: date = Field(description="End date for data collection")
+    fetch_window: Optional[str] = Field(
+        default=None,
+        description=(
+            "Split each station's range into windows fetched concurrently: "
+            "water_year, year, month, or a number of days. Unset fetches the range at once"
+        ),
+    )
 
 
 class Config(BaseModel):
-    """Main config for the snowfall analytics application"""
+    """
+    Main config for the snowfall analytics application
+
+    Configs are immutable and hashable, so one loaded snapshot can be shared
+    by every task of a run.
+    """
+
+    model_config = ConfigDict(frozen=True)
 
     data_dir: DirectoryPath = Field(
         default=Path("data"),
@@ -26,3 +42,23 @@ class Config(BaseModel):
     def db_path(self) -> Path:
         """Get the path to the DuckDB database file"""
         return self.data_dir / "snowfall.duckdb"
+
+    @property
+    def rate_limit_path(self) -> Path:
+        """Get the path to the learned NOAA rate limit state file"""
+        return self.data_dir / "rate_limit.json"
+
+    @property
+    def cache_dir(self) -> Path:
+        """Get the directory of the NOAA response cache"""
+        return self.data_dir / "cache"
+
+    @property
+    def parquet_dir(self) -> Path:
+        """Get the directory of the partitioned Parquet export"""
+        return self.data_dir / "parquet"
+
+    @property
+    def lake_dir(self) -> Path:
+        """Get the directory of the Parquet lake used by the parquet storage mode"""
+        return self.data_dir / "lake"
@@ -0,0 +1,217 @@
+import asyncio
+import contextlib
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from .config import Config, ConfigWatcher
+from .scheduler import StationScheduler
+
+logger = logging.getLogger(__name__)
+
+# Months in which snow falls and NOAA data changes most
+SNOW_SEASON_MONTHS = (10, 11, 12, 1, 2, 3, 4, 5)
+
+
+class RefreshSchedule(BaseModel):
+    """How often each station is refreshed"""
+
+    season_interval: timedelta = timedelta(hours=1)
+    off_season_interval: timedelta = timedelta(hours=24)
+    retry_interval: timedelta = timedelta(minutes=15)
+    season_months: Tuple[int, ...] = SNOW_SEASON_MONTHS
+
+    def interval(self, now: datetime, failed: bool = False) -> timedelta:
+        """
+        Time until the next refresh of a station refreshed at now
+
+        Args:
+            now: Time of the refresh
+            failed: Whether the refresh failed, which retries sooner
+
+        Returns:
+            Delay before the next refresh
+        """
+        interval = (
+            self.season_interval
+            if now.month in self.season_months
+            else self.off_season_interval
+        )
+        return min(interval, self.retry_interval) if failed else interval
+
+
+class StationStatus(BaseModel):
+    """Refresh state of one station in the daemon"""
+
+    next_due: datetime
+    runs: int = 0
+    failures: int = 0
+    last_success: Optional[datetime] = None
+    last_error: Optional[str] = None
+
+
+class DaemonStatus(BaseModel):
+    """Snapshot served by the health endpoint"""
+
+    status: str = "starting"
+    started_at: datetime
+    cycles: int = 0
+    stations: Dict[str, StationStatus] = Field(default_factory=dict)
+
+
+class IngestDaemon:
+    """
+    Refresh stations on a schedule until stopped
+
+    Everything the caller sets up once, such as the NOAA client's connection
+    pool and the database connections, stays open between refreshes. The
+    config is re-read from its watcher every cycle, so stations added to the
+    config file are picked up without a restart.
+    """
+
+    def __init__(
+        self,
+        config_source: ConfigWatcher,
+        refresh: Callable[[str, Config], Awaitable[None]],
+        schedule: RefreshSchedule | None = None,
+        max_in_flight: int = 4,
+        stations: List[str] | None = None,
+        after_cycle: Callable[[], Awaitable[None]] | None = None,
+    ):
+        """
+        Initialize daemon
+
+        Args:
+            config_source: Watcher providing the current config
+            refresh: Coroutine function fetching and storing one station
+            schedule: Refresh intervals, defaults to RefreshSchedule()
+            max_in_flight: Maximum number of stations refreshed at the same time
+            stations: Stations to refresh instead of the ones in the config
+            after_cycle: Coroutine function run after each cycle that refreshed
+                stations, such as an export of the new data
+        """
+        self.config_source = config_source
+        self.refresh = refresh
+        self.schedule = schedule or RefreshSchedule()
+        self.scheduler = StationScheduler(max_in_flight)
+        self.stations = stations
+        self.after_cycle = after_cycle
+        self.status = DaemonStatus(started_at=_now())
+        self.health_address: Tuple[str, int] | None = None
+        self._stop = asyncio.Event()
+
+    def stop(self) -> None:
+        """Ask the daemon to finish its current cycle and exit"""
+        self._stop.set()
+
+    def _sync_stations(self, config: Config) -> None:
+        """Add new stations as due now and forget removed ones"""
+        wanted = self.stations or list(config.stations.stations)
+        now = _now()
+        self.status.stations = {
+            station_id: self.status.stations.get(station_id) or StationStatus(next_due=now)
+            for station_id in wanted
+        }
+
+    async def run_cycle(self) -> None:
+        """Refresh every station that is due"""
+        config = self.config_source.current()
+        self._sync_stations(config)
+        now = _now()
+        due = sorted(
+            (s for s, state in self.status.stations.items() if state.next_due <= now),
+            key=lambda s: self.status.stations[s].next_due,
+        )
+        if not due:
+            return
+
+        logger.info(f"Refreshing {len(due)} station(s)")
+        results = await self.scheduler.run(
+            due, lambda station_id: self.refresh(station_id, config)
+        )
+
+        finished = _now()
+        for result in results:
+            state = self.status.stations[result.name]
+            state.runs += 1
+            if result.succeeded:
+                state.last_success = finished
+                state.last_error = None
+            else:
+                state.failures += 1
+                state.last_error = result.error
+            state.next_due = finished + self.schedule.interval(finished, not result.succeeded)
+        self.status.cycles += 1
+        failing = any(state.last_error for state in self.status.stations.values())
+        self.status.status = "degraded" if failing else "ok"
+
+        if self.after_cycle is not None:
+            try:
+                await self.after_cycle()
+            except Exception as e:
+                logger.error(f"After-cycle task failed: {str(e)}", exc_info=True)
+                self.status.status = "degraded"
+
+    def _seconds_until_due(self) -> float:
+        next_due = min((s.next_due for s in self.status.stations.values()), default=None)
+        if next_due is None:
+            return self.schedule.retry_interval.total_seconds()
+        return max(0.0, (next_due - _now()).total_seconds())
+
+    async def run(self) -> None:
+        """Run refresh cycles until stop() is called"""
+        logger.info("Daemon started")
+        while not self._stop.is_set():
+            await self.run_cycle()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._stop.wait(), self._seconds_until_due())
+        logger.info("Daemon stopped")
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+        """
+        Run refresh cycles with a health endpoint until stop() is called
+
+        GET /health returns the DaemonStatus as JSON.
+
+        Args:
+            host: Interface for the health endpoint, localhost by default
+            port: Port for the health endpoint, 0 to pick a free one
+        """
+        server = await asyncio.start_server(self._handle_health, host, port)
+        self.health_address = server.sockets[0].getsockname()[:2]
+        logger.info(f"Health endpoint on http://{host}:{self.health_address[1]}/health")
+        async with server:
+            await self.run()
+
+    async def _handle_health(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=5)
+            method, path, _ = request.decode("latin-1").split(" ", 2)
+            if method == "GET" and path in ("/", "/health"):
+                code, body = "200 OK", self.status.model_dump_json().encode()
+            else:
+                code, body = "404 Not Found", json.dumps({"error": "not found"}).encode()
+            writer.write(
+                f"HTTP/1.1 {code}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        except (
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+            TimeoutError,
+            ValueError,
+        ):
+            pass  # malformed or abandoned request
+        finally:
+            writer.close()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
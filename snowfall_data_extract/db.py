@@ -1,23 +1,68 @@
+import contextlib
 import types
+from datetime import date, timedelta
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import duckdb
+import pandas as pd
+from pydantic import BaseModel
 
-from .noaa import WeatherData, WeatherStation
+from .lake import ParquetLake
+from .noaa import (
+    WeatherColumns,
+    WeatherData,
+    WeatherStation,
+    column_rows,
+    weather_data_columns,
+)
 from .sql_loader import SQLLoader
 
 
+class JobRecord(BaseModel):
+    """Outcome of one fetch job, as recorded in the job ledger"""
+
+    station_ids: List[str]
+    start_date: date
+    end_date: date
+    status: str = "done"
+    response_bytes: int = 0
+    duration: float = 0.0
+    error: Optional[str] = None
+    # Earliest date returned per station; for a finished job the dates before
+    # it, or the whole window for a station without data, are known to be empty
+    first_dates: Dict[str, date] = {}
+
+
+class StationUpsertCounts(BaseModel):
+    """How many stations a bulk upsert inserted, updated or left unchanged"""
+
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+
 class WeatherDatabase:
-    """Handles database operations for weather data using DuckDB"""
+    """
+    Handles database operations for weather data using DuckDB
 
-    def __init__(self, db_path: Path, sql_dir: Path | None = None):
+    Weather data is kept in the weather_data table by default. With a lake
+    directory it is stored as append-only Parquet files behind a weather_data
+    view instead (see ParquetLake), while stations and the job ledger stay in
+    DuckDB tables.
+    """
+
+    def __init__(
+        self, db_path: Path, sql_dir: Path | None = None, lake_dir: Path | None = None
+    ):
         """
         Initialize database connection and schema
 
         Args:
             db_path: Path to DuckDB database file
             sql_dir: Path to SQL files directory
+            lake_dir: Directory to store weather data as Parquet files in, instead
+                of the weather_data table
         """
         self.conn = duckdb.connect(str(db_path))
 
@@ -25,14 +70,103 @@ class WeatherDatabase:
             sql_dir = Path(__file__).parent / "sql"
         self.sql = SQLLoader(sql_dir)
 
-        self._init_schema()
+        self._in_transaction = False
+        self._commit_every_n_rows: int | None = None
+        self._uncommitted_rows = 0
+
+        self.lake: ParquetLake | None = None
+        try:
+            self._init_schema(lake_dir)
+        except BaseException:
+            self.conn.close()
+            raise
 
-    def _init_schema(self) -> None:
+    def _init_schema(self, lake_dir: Path | None = None) -> None:
         """Initialize database schema from SQL files"""
-        schema_files = ["schema/weather_station", "schema/weather_data"]
+        schema_files = [
+            "schema/weather_station",
+            "schema/fetch_job",
+            "schema/station_empty_range",
+        ]
+        if lake_dir is None:
+            schema_files.append("schema/weather_data")
         for name in schema_files:
             self.conn.execute(self.sql.get_query(name))
 
+        if lake_dir is not None:
+            stored = self.conn.execute(
+                "SELECT COUNT(*) FROM duckdb_tables() "
+                "WHERE table_name = 'weather_data' AND NOT temporary"
+            ).fetchone()
+            if stored and stored[0]:
+                raise ValueError(
+                    "Database already stores weather_data as a table, "
+                    "so it can't be used with a Parquet lake"
+                )
+            self.lake = ParquetLake(self.conn, self.sql, lake_dir)
+
+    @contextlib.contextmanager
+    def transaction(self, commit_every_n_rows: int | None = None) -> Iterator[None]:
+        """
+        Group writes into one transaction instead of autocommitting each call
+
+        Everything written inside the block is committed when it exits, or
+        rolled back if it raises. With commit_every_n_rows, a long-running
+        block commits whenever that many weather data rows have accumulated,
+        but only after a weather data upsert, so a station's metadata written
+        before its observations lands in the same commit. Blocks nest: an inner
+        block joins the outer transaction.
+
+        Args:
+            commit_every_n_rows: Weather data rows after which to commit, or None
+                to commit only when the block exits
+        """
+        if self._in_transaction:
+            yield
+            return
+
+        self.conn.begin()
+        self._in_transaction = True
+        self._commit_every_n_rows = commit_every_n_rows
+        self._uncommitted_rows = 0
+        try:
+            yield
+            self._commit()
+        except BaseException:
+            self.conn.rollback()
+            if self.lake is not None:
+                self.lake.discard()
+            raise
+        finally:
+            self._in_transaction = False
+            self._commit_every_n_rows = None
+
+    def _commit(self) -> None:
+        # Lake files go first, so a crash can't commit jobs whose rows are unpublished
+        if self.lake is not None:
+            self.lake.publish()
+        self.conn.commit()
+
+    def _rows_written(self, rows: int) -> None:
+        """Commit the open transaction once it holds commit_every_n_rows rows"""
+        self._uncommitted_rows += rows
+        limit = self._commit_every_n_rows
+        if limit is not None and self._uncommitted_rows >= limit:
+            self._commit()
+            self.conn.begin()
+            self._uncommitted_rows = 0
+
+    def _drop_staging(self, table: str) -> None:
+        """
+        Drop a temp staging table once a batch is done with it
+
+        A failed statement inside an outer transaction leaves it aborted, and
+        the DROP would raise TransactionException in place of the original
+        error. The outer rollback discards the table anyway, so it is skipped.
+        """
+        with contextlib.suppress(duckdb.TransactionException):
+            self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+
     def upsert_station(self, station: WeatherStation) -> None:
         """
         Insert or update weather station information
@@ -51,36 +185,263 @@ class WeatherDatabase:
             ),
         )
 
-    def upsert_weather_data(self, data: List[WeatherData]) -> None:
+    def upsert_stations(self, stations: List[WeatherStation]) -> StationUpsertCounts:
         """
-        Insert weather data records
+        Insert new stations and update changed ones in bulk
+
+        The batch is compared with weather_station in one query, and only rows
+        that are new or differ in name, position or elevation are written, so
+        unchanged metadata doesn't churn the table. When a batch holds the same
+        station more than once, the last one wins.
+
+        Args:
+            stations: WeatherStation objects to store
+
+        Returns:
+            Number of stations inserted, updated and unchanged
+        """
+        if not stations:
+            return StationUpsertCounts()
+
+        self.conn.register("weather_station_batch", _weather_station_frame(stations))
+        try:
+            with self.transaction():
+                self.conn.execute(self.sql.get_query("queries/stage_weather_stations"))
+                counts = self.conn.execute(
+                    self.sql.get_query("queries/count_staged_weather_stations")
+                ).fetchall()
+                self.conn.execute(self.sql.get_query("queries/upsert_weather_stations"))
+        finally:
+            self.conn.unregister("weather_station_batch")
+            self._drop_staging("weather_station_staging")
+        return StationUpsertCounts(**dict(counts))
+
+    def upsert_weather_data(self, data: List[WeatherData]) -> int:
+        """
+        Insert or update weather data records
+
+        The batch is loaded column-wise into a temp staging table and merged into
+        weather_data with a single set-based statement. When a batch holds the
+        same (station_id, date) more than once, the last record wins. Each row
+        carries a hash of its values, and rows whose hash matches the stored one
+        are skipped, so refetching an overlapping window writes only what changed.
 
         Args:
             data: List of WeatherData objects to insert
+
+        Returns:
+            Number of rows inserted or changed
+        """
+        return self.upsert_weather_columns(weather_data_columns(data))
+
+    def upsert_weather_columns(self, columns: WeatherColumns) -> int:
+        """
+        Insert or update weather data held as columns
+
+        Same as upsert_weather_data, for batches that are already columnar.
+
+        Args:
+            columns: Weather data columns as built by weather_data_columns
+
+        Returns:
+            Number of rows inserted or changed
+        """
+        rows = column_rows(columns)
+        if not rows:
+            return 0
+
+        self.conn.register("weather_data_batch", _weather_data_frame(columns))
+        try:
+            with self.transaction():
+                self.conn.execute(self.sql.get_query("queries/stage_weather_data"))
+                if self.lake is not None:
+                    written = self.lake.append_staged()
+                else:
+                    result = self.conn.execute(
+                        self.sql.get_query("queries/upsert_weather_data")
+                    ).fetchone()
+                    written = int(result[0]) if result else 0
+        finally:
+            self.conn.unregister("weather_data_batch")
+            self._drop_staging("weather_data_staging")
+        if self._in_transaction:
+            self._rows_written(rows)
+        return written
+
+    def compact_weather_data(self, min_files: int = 16, grace_seconds: float = 3600) -> int:
+        """
+        Merge the Parquet lake's small files, if weather data is stored in one
+
+        Args:
+            min_files: Only compact once the lake holds at least this many files
+            grace_seconds: Seconds to keep merged files for readers still scanning them
+
+        Returns:
+            Number of files merged, 0 without a lake or with too few files
         """
-        if not data:
+        if self.lake is None:
+            return 0
+        return self.lake.compact(min_files, grace_seconds)
+
+    def get_missing_ranges(
+        self,
+        station_id: str,
+        start_date: date,
+        end_date: date,
+        refresh_days: int = 7,
+        fill_gaps: bool = False,
+        min_gap_days: int = 1,
+    ) -> List[Tuple[date, date]]:
+        """
+        Find the date ranges of a station that still need to be fetched
+
+        Everything before the first stored date and after the last stored date is
+        missing, and the trailing refresh window is always refetched because NOAA
+        revises recent observations. Dates that a finished job found empty, such
+        as the years before a station's record begins, are not missing.
+
+        Args:
+            station_id: NOAA station ID
+            start_date: First date of the configured range
+            end_date: Last date of the configured range
+            refresh_days: Number of days before end_date to always refetch
+            fill_gaps: Also refetch holes between stored dates
+            min_gap_days: Only holes of at least this many missing days are refetched
+
+        Returns:
+            Sorted, non-overlapping inclusive (start, end) ranges
+        """
+        bounds = self.conn.execute(
+            self.sql.get_query("queries/select_station_date_bounds"),
+            (station_id, start_date, end_date),
+        ).fetchone()
+
+        first_date, last_date = bounds if bounds is not None else (None, None)
+        ranges: List[Tuple[date, date]] = []
+
+        head_end = first_date - timedelta(days=1) if first_date else end_date
+        if head_end >= start_date:
+            empty = self.conn.execute(
+                self.sql.get_query("queries/select_station_empty_ranges"),
+                (station_id, head_end, start_date),
+            ).fetchall()
+            ranges.extend(_subtract_ranges((start_date, head_end), empty))
+
+        if fill_gaps:
+            gaps = self.conn.execute(
+                self.sql.get_query("queries/select_station_date_gaps"),
+                (station_id, start_date, end_date, min_gap_days),
+            ).fetchall()
+            ranges.extend((gap_start, gap_end) for gap_start, gap_end in gaps)
+
+        tail_start = (
+            last_date + timedelta(days=1) if last_date else end_date + timedelta(days=1)
+        )
+        if refresh_days > 0:
+            tail_start = min(tail_start, end_date - timedelta(days=refresh_days - 1))
+        tail_start = max(tail_start, start_date)
+        if tail_start <= end_date:
+            ranges.append((tail_start, end_date))
+
+        return _merge_ranges(ranges)
+
+    def get_last_dates(self, station_ids: List[str]) -> Dict[str, Optional[date]]:
+        """
+        Get the most recent stored date for each station
+
+        Args:
+            station_ids: NOAA station IDs
+
+        Returns:
+            Last stored date keyed by station ID, None for stations without data
+        """
+        rows = self.conn.execute(
+            self.sql.get_query("queries/select_station_last_dates")
+        ).fetchall()
+        last_dates: Dict[str, date] = {station_id: last_date for station_id, last_date in rows}
+        return {station_id: last_dates.get(station_id) for station_id in station_ids}
+
+    def plan_jobs(self, jobs: List[Tuple[List[str], date, date]]) -> None:
+        """
+        Start a new job ledger holding the given jobs as pending
+
+        Args:
+            jobs: (station IDs, start date, end date) units in the order to run them
+        """
+        plan = pd.DataFrame(
+            {
+                "station_ids": [",".join(station_ids) for station_ids, _, _ in jobs],
+                "start_date": [start_date for _, start_date, _ in jobs],
+                "end_date": [end_date for _, _, end_date in jobs],
+                "position": range(len(jobs)),
+            }
+        )
+        with self.transaction():
+            self.conn.execute("DELETE FROM fetch_job")
+            if jobs:
+                self.conn.register("fetch_job_plan", plan)
+                try:
+                    self.conn.execute(self.sql.get_query("queries/plan_fetch_jobs"))
+                finally:
+                    self.conn.unregister("fetch_job_plan")
+
+    def record_jobs(self, records: List[JobRecord]) -> None:
+        """
+        Record job outcomes in the ledger, counting an attempt for each
+
+        Finished jobs also record the dates they found empty per station, so
+        get_missing_ranges doesn't request them again.
+
+        Args:
+            records: Finished or failed jobs
+        """
+        if not records:
             return
+        self.conn.executemany(
+            self.sql.get_query("queries/record_fetch_job"),
+            [
+                (
+                    ",".join(r.station_ids),
+                    r.start_date,
+                    r.end_date,
+                    r.status,
+                    r.response_bytes,
+                    r.duration,
+                    r.error,
+                )
+                for r in records
+            ],
+        )
 
-        # Convert data to list of tuples for bulk insert
-        values = [
-            (
-                record.station_id,
-                record.date,
-                record.precipitation,
-                record.precipitation_attributes,
-                record.snowfall,
-                record.snowfall_attributes,
-                record.snow_depth,
-                record.snow_depth_attributes,
-                record.temp_max,
-                record.temp_max_attributes,
-                record.temp_min,
-                record.temp_min_attributes,
+        empty: List[Tuple[str, date, date]] = []
+        for r in records:
+            if r.status != "done":
+                continue
+            for station_id in r.station_ids:
+                first = r.first_dates.get(station_id, r.end_date + timedelta(days=1))
+                if first > r.start_date:
+                    empty.append((station_id, r.start_date, first - timedelta(days=1)))
+        if empty:
+            self.conn.executemany(
+                self.sql.get_query("queries/record_station_empty_range"), empty
             )
-            for record in data
-        ]
 
-        self.conn.executemany(self.sql.get_query("queries/upsert_weather_data"), values)
+    def has_job_plan(self) -> bool:
+        """Check whether the ledger holds the jobs of a pipeline run"""
+        planned = self.conn.execute("SELECT COUNT(*) FROM fetch_job").fetchone()
+        return bool(planned and planned[0])
+
+    def get_unfinished_jobs(self) -> List[Tuple[List[str], date, date]]:
+        """
+        Get the ledger's jobs that haven't completed, in planned order
+
+        Returns:
+            (station IDs, start date, end date) of pending and failed jobs
+        """
+        rows = self.conn.execute(
+            self.sql.get_query("queries/select_unfinished_fetch_jobs")
+        ).fetchall()
+        return [(station_ids.split(","), start, end) for station_ids, start, end in rows]
 
     def close(self) -> None:
         """Close the database connection"""
@@ -96,3 +457,57 @@ class WeatherDatabase:
         exc_tb: types.TracebackType | None,
     ) -> None:
         self.close()
+
+
+def _merge_ranges(ranges: List[Tuple[date, date]]) -> List[Tuple[date, date]]:
+    """Merge overlapping or adjacent inclusive date ranges"""
+    merged: List[Tuple[date, date]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _subtract_ranges(
+    span: Tuple[date, date], covered: List[Tuple[date, date]]
+) -> List[Tuple[date, date]]:
+    """Parts of an inclusive date range outside sorted inclusive ranges"""
+    start, end = span
+    remaining: List[Tuple[date, date]] = []
+    for cover_start, cover_end in covered:
+        if start > end:
+            break
+        if cover_start > start:
+            remaining.append((start, min(end, cover_start - timedelta(days=1))))
+        start = max(start, cover_end + timedelta(days=1))
+    if start <= end:
+        remaining.append((start, end))
+    return remaining
+
+
+def _weather_station_frame(stations: List[WeatherStation]) -> pd.DataFrame:
+    """Build a frame of stations for bulk loading, with decimals as exact strings"""
+    return pd.DataFrame(
+        {
+            "batch_row": range(len(stations)),
+            "station_id": [s.station_id for s in stations],
+            "station_name": [s.name for s in stations],
+            "latitude": [format(s.latitude, "f") for s in stations],
+            "longitude": [format(s.longitude, "f") for s in stations],
+            "elevation": [format(s.elevation, "f") for s in stations],
+        }
+    )
+
+
+def _weather_data_frame(columns: WeatherColumns) -> pd.DataFrame:
+    """Build a frame of weather data columns for bulk loading"""
+    return pd.DataFrame(
+        {
+            "batch_row": range(column_rows(columns)),
+            **columns,
+            "temp_max": pd.array(columns["temp_max"], dtype="Int64"),
+            "temp_min": pd.array(columns["temp_min"], dtype="Int64"),
+        }
+    )
@@ -0,0 +1,191 @@
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import pandas as pd
+from pydantic import BaseModel, Field
+
+from .db import WeatherDatabase
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "_manifest.json"
+
+
+class PartitionState(BaseModel):
+    """What an exported partition was written from"""
+
+    rows: int
+    fingerprint: int
+
+
+class ExportManifest(BaseModel):
+    """Exported partitions keyed by "<station_id>/<year>" """
+
+    partitions: Dict[str, PartitionState] = Field(default_factory=dict)
+
+
+class ExportResult(BaseModel):
+    """Partitions an export wrote, left alone, or removed"""
+
+    written: int = 0
+    unchanged: int = 0
+    removed: int = 0
+
+
+class ParquetExporter:
+    """
+    Incremental Hive-partitioned Parquet export of weather_data
+
+    Readers such as dashboards and notebooks scan the export instead of
+    opening the DuckDB file, which would lock out the extractor:
+
+        SELECT * FROM read_parquet('data/parquet/**/*.parquet', hive_partitioning = true)
+
+    Each station and year is one partition directory, such as
+    station_id=USW00014838/year=2024, with rows sorted by date so readers can
+    skip partitions by path and row groups by date statistics.
+
+    Every partition has a fingerprint computed from the stored row hashes,
+    and the manifest in the export directory remembers the fingerprint each
+    partition was written with. An export rewrites only partitions whose
+    fingerprint changed, in one partitioned COPY, and removes partitions whose
+    rows are gone. Files are written next to the export directory and moved
+    into place, so readers never see a partly written file.
+    """
+
+    def __init__(
+        self,
+        db: WeatherDatabase,
+        export_dir: Path,
+        row_group_size: int = 122_880,
+        compression: str = "zstd",
+    ):
+        """
+        Initialize exporter
+
+        Args:
+            db: Database to export from
+            export_dir: Root directory of the partitioned dataset
+            row_group_size: Maximum rows per Parquet row group
+            compression: Parquet compression codec
+        """
+        self.db = db
+        self.export_dir = Path(export_dir)
+        self.row_group_size = row_group_size
+        self.compression = compression
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.export_dir / MANIFEST_NAME
+
+    def partition_dir(self, station_id: str, year: int) -> Path:
+        """Directory holding the files of one station and year"""
+        return self.export_dir / f"station_id={station_id}" / f"year={year}"
+
+    def load_manifest(self) -> ExportManifest:
+        """Read the manifest, or an empty one if nothing was exported yet"""
+        try:
+            return ExportManifest.model_validate_json(self.manifest_path.read_bytes())
+        except FileNotFoundError:
+            return ExportManifest()
+        except ValueError as e:
+            logger.warning(f"Ignoring unreadable export manifest, exporting everything: {e}")
+            return ExportManifest()
+
+    def export(self) -> ExportResult:
+        """
+        Bring the Parquet dataset up to date with weather_data
+
+        Returns:
+            Number of partitions written, unchanged and removed
+        """
+        self.export_dir.mkdir(parents=True, exist_ok=True)
+        previous = self.load_manifest()
+        manifest = ExportManifest()
+        changed: List[Tuple[str, int]] = []
+
+        # One snapshot for the fingerprints and the rows that are written
+        with self.db.transaction():
+            partitions = self.db.conn.execute(
+                self.db.sql.get_query("queries/select_export_partitions")
+            ).fetchall()
+            for station_id, year, rows, fingerprint in partitions:
+                key = f"{station_id}/{year}"
+                state = PartitionState(rows=rows, fingerprint=fingerprint)
+                manifest.partitions[key] = state
+                if (
+                    previous.partitions.get(key) != state
+                    or not self.partition_dir(station_id, year).exists()
+                ):
+                    changed.append((station_id, year))
+            if changed:
+                self._write_partitions(changed)
+
+        removed = previous.partitions.keys() - manifest.partitions.keys()
+        for key in removed:
+            station_id, year = key.rsplit("/", 1)
+            partition_dir = self.partition_dir(station_id, int(year))
+            shutil.rmtree(partition_dir, ignore_errors=True)
+            station_dir = partition_dir.parent
+            if station_dir.exists() and not any(station_dir.iterdir()):
+                station_dir.rmdir()
+
+        self._save_manifest(manifest)
+        result = ExportResult(
+            written=len(changed),
+            unchanged=len(manifest.partitions) - len(changed),
+            removed=len(removed),
+        )
+        logger.info(
+            f"Parquet export: {result.written} partitions written, "
+            f"{result.unchanged} unchanged, {result.removed} removed"
+        )
+        return result
+
+    def _write_partitions(self, partitions: List[Tuple[str, int]]) -> None:
+        """Write the given partitions to a staging directory and swap them in"""
+        selected = pd.DataFrame(
+            {
+                "station_id": [station_id for station_id, _ in partitions],
+                "year": [year for _, year in partitions],
+            }
+        )
+        staging = Path(tempfile.mkdtemp(prefix=".parquet-export-", dir=self.export_dir.parent))
+        self.db.conn.register("export_partitions", selected)
+        try:
+            query = self.db.sql.get_query("queries/select_export_weather_data")
+            target = str(staging / "partitions").replace("'", "''")
+            self.db.conn.execute(
+                f"COPY ({query}) TO '{target}' (FORMAT parquet, "
+                f"PARTITION_BY (station_id, year), "
+                f"ROW_GROUP_SIZE {int(self.row_group_size)}, "
+                f"COMPRESSION '{self.compression}')"
+            )
+            for station_id, year in partitions:
+                self._swap_in(
+                    staging / "partitions" / f"station_id={station_id}" / f"year={year}",
+                    self.partition_dir(station_id, year),
+                )
+        finally:
+            self.db.conn.unregister("export_partitions")
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _swap_in(self, source: Path, destination: Path) -> None:
+        """Replace the files of a partition, one atomic rename per file"""
+        destination.mkdir(parents=True, exist_ok=True)
+        names = set()
+        for path in source.glob("*.parquet"):
+            os.replace(path, destination / path.name)
+            names.add(path.name)
+        for stale in destination.glob("*.parquet"):
+            if stale.name not in names:
+                stale.unlink()
+
+    def _save_manifest(self, manifest: ExportManifest) -> None:
+        temp_path = self.manifest_path.with_suffix(".tmp")
+        temp_path.write_text(manifest.model_dump_json(indent=2))
+        os.replace(temp_path, self.manifest_path)
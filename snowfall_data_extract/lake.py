@@ -0,0 +1,191 @@
+import contextlib
+import logging
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import List
+
+import duckdb
+
+from .sql_loader import SQLLoader
+
+logger = logging.getLogger(__name__)
+
+_PART_GLOB = "part-*.parquet"
+_PENDING_SUFFIX = ".pending"
+
+
+class ParquetLake:
+    """
+    Weather data stored as immutable Parquet files instead of a DuckDB table
+
+    Every upsert appends one file of new or changed rows, tagged with a load
+    sequence number, and a temp view named weather_data shows the newest
+    version of each (station_id, date). Appends are sequential file writes
+    with no primary key index to maintain, and the files can be read by other
+    processes while ingest runs. The files also hold superseded versions of
+    changed rows, so readers keep the newest one as the view does:
+
+        SELECT * EXCLUDE (loaded_seq)
+        FROM read_parquet('data/lake/weather_data/part-*.parquet')
+        QUALIFY ROW_NUMBER() OVER (
+            PARTITION BY station_id, date ORDER BY loaded_seq DESC
+        ) = 1
+
+    Appended files stay pending until the surrounding transaction commits, so
+    a rolled back write leaves nothing behind. They are published before the
+    DuckDB commit: a crash in between leaves rows that a replay rewrites as
+    unchanged, never a committed job whose rows are missing. Pending files
+    left by a crash are deleted when the lake is next opened. Small files are
+    merged by compact(), which leaves the merged files in place for a grace
+    period so readers already scanning them can finish.
+    """
+
+    def __init__(self, conn: duckdb.DuckDBPyConnection, sql: SQLLoader, lake_dir: Path):
+        """
+        Open the lake and create the weather_data view on the connection
+
+        Args:
+            conn: Connection the view is created on
+            sql: Loader for the lake's SQL files
+            lake_dir: Root directory of the lake
+        """
+        self.conn = conn
+        self.sql = sql
+        self.data_dir = Path(lake_dir) / "weather_data"
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self._pending: List[Path] = []
+        self.conn.execute(self.sql.get_query("schema/lake_superseded_file"))
+
+        # Left by a crashed run; the database file lock keeps other processes out
+        for stale in self.data_dir.glob(f"*{_PENDING_SUFFIX}"):
+            logger.warning(f"Deleting unpublished lake file {stale.name}")
+            stale.unlink(missing_ok=True)
+
+        if not self.files():
+            # The view needs a file to take the schema from
+            empty = self._new_path(0)
+            pending = self._pending_path(empty)
+            self._copy(
+                f"({self.sql.get_query('queries/select_empty_lake_weather_data')})", pending
+            )
+            os.replace(pending, empty)
+        glob = str(self.data_dir / _PART_GLOB).replace("'", "''")
+        self.conn.execute(self.sql.get_query("schema/weather_data_lake").format(files=glob))
+
+    def files(self) -> List[Path]:
+        """Published data files not yet merged by a compaction, oldest first"""
+        superseded = {
+            name
+            for (name,) in self.conn.execute(
+                "SELECT file_name FROM lake_superseded_file"
+            ).fetchall()
+        }
+        return sorted(f for f in self.data_dir.glob(_PART_GLOB) if f.name not in superseded)
+
+    def append_staged(self) -> int:
+        """
+        Write the rows of weather_data_staging that differ from the lake
+
+        Returns:
+            Number of rows appended
+        """
+        bounds = self.conn.execute(
+            self.sql.get_query("queries/select_staged_weather_data_bounds")
+        ).fetchone()
+        seq = time.time_ns()
+        self.conn.execute(
+            self.sql.get_query("queries/stage_lake_weather_data"), (seq, *(bounds or ()))
+        )
+        try:
+            counted = self.conn.execute("SELECT COUNT(*) FROM weather_data_append").fetchone()
+            rows = int(counted[0]) if counted else 0
+            if rows:
+                pending = self._pending_path(self._new_path(seq))
+                self._copy("weather_data_append", pending)
+                self._pending.append(pending)
+        finally:
+            # Skipped if a failure aborted the transaction, whose rollback drops it
+            with contextlib.suppress(duckdb.TransactionException):
+                self.conn.execute("DROP TABLE IF EXISTS weather_data_append")
+        return rows
+
+    def publish(self) -> None:
+        """Make the files appended since the last commit visible"""
+        for pending in self._pending:
+            os.replace(pending, pending.with_suffix(""))
+        self._pending.clear()
+
+    def discard(self) -> None:
+        """Delete the files appended since the last commit"""
+        for pending in self._pending:
+            pending.unlink(missing_ok=True)
+        self._pending.clear()
+
+    def compact(self, min_files: int = 16, grace_seconds: float = 3600) -> int:
+        """
+        Merge the lake's files into one holding only the newest rows
+
+        Files appended while compacting are left alone. Their rows are newer,
+        so they keep winning over the compacted file.
+
+        The merged files are not deleted right away, since a reader may have
+        listed them before the compacted file was published. They stay on
+        disk, and in the part-*.parquet glob, until a compact() call at least
+        grace_seconds later deletes them. Until then readers scan their rows
+        twice, which changes nothing: the compacted file holds the same rows
+        with the same load sequence numbers.
+
+        Args:
+            min_files: Only compact once there are at least this many files
+            grace_seconds: Seconds to keep merged files before deleting them
+
+        Returns:
+            Number of files merged, 0 if there were too few
+        """
+        self._delete_superseded(grace_seconds)
+        files = self.files()
+        if len(files) < min_files:
+            return 0
+
+        path = self._new_path(time.time_ns())
+        pending = self._pending_path(path)
+        query = self.sql.get_query("queries/select_compacted_lake_weather_data")
+        self._copy(f"({query})", pending, [str(f) for f in files])
+        os.replace(pending, path)
+        # Recorded after publishing: a crash in between only merges the files again
+        self.conn.executemany(
+            self.sql.get_query("queries/record_lake_superseded_file"),
+            [(old.name,) for old in files],
+        )
+        logger.info(f"Compacted {len(files)} lake files into {path.name}")
+        return len(files)
+
+    def _delete_superseded(self, grace_seconds: float) -> None:
+        """Delete files merged by a compaction at least grace_seconds ago"""
+        expired = self.conn.execute(
+            self.sql.get_query("queries/select_expired_lake_superseded_files"),
+            (grace_seconds,),
+        ).fetchall()
+        if not expired:
+            return
+        for (name,) in expired:
+            (self.data_dir / name).unlink(missing_ok=True)
+        self.conn.executemany(
+            self.sql.get_query("queries/delete_lake_superseded_file"), expired
+        )
+        logger.info(f"Deleted {len(expired)} lake files merged by an earlier compaction")
+
+    def _new_path(self, seq: int) -> Path:
+        return self.data_dir / f"part-{seq:019d}-{uuid.uuid4().hex[:8]}.parquet"
+
+    @staticmethod
+    def _pending_path(path: Path) -> Path:
+        return path.with_name(path.name + _PENDING_SUFFIX)
+
+    def _copy(self, source: str, path: Path, *params: object) -> None:
+        target = str(path).replace("'", "''")
+        self.conn.execute(
+            f"COPY {source} TO '{target}' (FORMAT parquet, COMPRESSION zstd)", params or None
+        )
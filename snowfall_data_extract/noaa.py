@@ -1,45 +1,237 @@
 import asyncio
+import importlib.util
+import io
+import json
 import logging
 import time
 import types
 from datetime import date as Date
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Any, Dict, List, Optional, Tuple
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 import httpx
+import pandas as pd
+import pydantic_core
 from httpx import ConnectError, HTTPStatusError, RemoteProtocolError, TransportError
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 
+from .cache import ResponseCache
 from .config import StationConfig
+from .streaming import iter_json_array
 
 logger = logging.getLogger(__name__)
 
 
 class RateLimit:
-    """Simple rate limiter to prevent API throttling"""
+    """Token-bucket rate limiter shared by concurrent requests to prevent API throttling"""
 
-    def __init__(self, calls_per_minute: int = 5):
+    def __init__(self, calls_per_minute: float = 5, burst: int = 1):
         """
         Initialize rate limiter
 
         Args:
             calls_per_minute: Maximum number of calls allowed per minute
+            burst: Number of calls that may be made back to back before spacing applies
         """
         self.calls_per_minute = calls_per_minute
         self.min_interval = 60.0 / calls_per_minute  # seconds between calls
-        self.last_call_time = 0.0
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+        # asyncio.Lock wakes waiters in arrival order, which keeps the queue FIFO
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self.last_refill
+        self.tokens = min(float(self.burst), self.tokens + elapsed / self.min_interval)
+        self.last_refill = now
+
+    def _pause_seconds(self) -> float:
+        """Time every caller must wait before any call, such as a server-requested pause"""
+        return 0.0
 
     async def wait(self) -> None:
-        """Wait if needed to maintain the rate limit"""
-        current_time = time.time()
-        elapsed = current_time - self.last_call_time
+        """Wait until a call is allowed, in the order callers arrived"""
+        async with self._lock:
+            # Re-checked after every sleep, as a pause can start while the head waits
+            while True:
+                pause = self._pause_seconds()
+                if pause > 0:
+                    logger.debug(f"Rate limiting: honoring Retry-After, waiting {pause:.2f}s")
+                    await asyncio.sleep(pause)
+                    continue
+                self._refill()
+                if self.tokens >= 1:
+                    break
+                wait_time = (1 - self.tokens) * self.min_interval
+                logger.debug(f"Rate limiting: waiting {wait_time:.2f}s")
+                await asyncio.sleep(wait_time)
+            self.tokens -= 1
+
+    def record_success(self) -> None:
+        """Feedback hook called after a successful response"""
+
+    def record_throttle(self, retry_after: float | None = None) -> None:
+        """Feedback hook called after a 429 or 5xx response"""
+
+
+class AdaptiveRateLimit(RateLimit):
+    """
+    AIMD rate limiter that learns the sustainable request rate
+
+    The rate grows additively after a run of healthy responses and is cut
+    multiplicatively on a 429 or 5xx. A Retry-After from the server pauses
+    every waiter until it has elapsed.
+    """
+
+    def __init__(
+        self,
+        calls_per_minute: float = 5,
+        burst: int = 1,
+        min_calls_per_minute: float = 1,
+        max_calls_per_minute: float = 60,
+        increase: float = 1,
+        decrease_factor: float = 0.5,
+        success_threshold: int = 5,
+    ):
+        """
+        Initialize adaptive rate limiter
 
-        if elapsed < self.min_interval and self.last_call_time > 0:
-            wait_time = self.min_interval - elapsed
-            logger.debug(f"Rate limiting: waiting {wait_time:.2f}s")
-            await asyncio.sleep(wait_time)
+        Args:
+            calls_per_minute: Starting number of calls allowed per minute
+            burst: Number of calls that may be made back to back
+            min_calls_per_minute: Lower bound for the learned rate
+            max_calls_per_minute: Upper bound for the learned rate
+            increase: Calls per minute added after success_threshold healthy responses
+            decrease_factor: Multiplier applied to the rate on throttling
+            success_threshold: Consecutive successes required before increasing
+        """
+        super().__init__(calls_per_minute, burst)
+        self.min_calls_per_minute = min_calls_per_minute
+        self.max_calls_per_minute = max_calls_per_minute
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.success_threshold = success_threshold
+        self.consecutive_successes = 0
+        self.blocked_until = 0.0
+
+    def set_rate(self, calls_per_minute: float) -> None:
+        """Change the rate, clamped to the configured bounds"""
+        calls_per_minute = min(
+            self.max_calls_per_minute, max(self.min_calls_per_minute, calls_per_minute)
+        )
+        self._refill()
+        self.calls_per_minute = calls_per_minute
+        self.min_interval = 60.0 / calls_per_minute
+
+    def _pause_seconds(self) -> float:
+        return self.blocked_until - time.monotonic()
+
+    def record_success(self) -> None:
+        self.consecutive_successes += 1
+        if self.consecutive_successes >= self.success_threshold:
+            self.consecutive_successes = 0
+            if self.calls_per_minute < self.max_calls_per_minute:
+                self.set_rate(self.calls_per_minute + self.increase)
+                logger.debug(f"Rate limit raised to {self.calls_per_minute:.1f} calls/min")
+
+    def record_throttle(self, retry_after: float | None = None) -> None:
+        self.consecutive_successes = 0
+        self.set_rate(self.calls_per_minute * self.decrease_factor)
+        # Drop any saved-up burst so the lower rate applies immediately
+        self.tokens = min(self.tokens, 0.0)
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+        logger.info(f"Rate limit lowered to {self.calls_per_minute:.1f} calls/min")
+
+    @classmethod
+    def load(cls, state_path: Path, **kwargs: Any) -> "AdaptiveRateLimit":
+        """
+        Create a limiter starting from the rate learned in a previous run
+
+        Args:
+            state_path: JSON file written by save()
+            **kwargs: Passed through to the constructor
+
+        Returns:
+            AdaptiveRateLimit using the saved rate if the file exists
+        """
+        limiter = cls(**kwargs)
+        if state_path.exists():
+            state = json.loads(state_path.read_text())
+            limiter.set_rate(float(state["calls_per_minute"]))
+        return limiter
 
-        self.last_call_time = time.time()
+    def save(self, state_path: Path) -> None:
+        """Persist the learned rate for the next run"""
+        state_path.write_text(json.dumps({"calls_per_minute": self.calls_per_minute}))
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a Retry-After header value
+
+    Args:
+        value: Header value, either delay seconds or an HTTP date
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def split_date_range(start_date: Date, end_date: Date, window: str) -> List[Tuple[Date, Date]]:
+    """
+    Split an inclusive date range into consecutive windows
+
+    Args:
+        start_date: First date of the range
+        end_date: Last date of the range
+        window: "water_year" (Oct 1 - Sep 30), "year", "month", or a number of days
+
+    Returns:
+        List of inclusive (start, end) date pairs covering the range in order
+    """
+    if end_date < start_date:
+        return []
+
+    windows: List[Tuple[Date, Date]] = []
+    current = start_date
+    while current <= end_date:
+        if window == "water_year":
+            year = current.year + 1 if current.month >= 10 else current.year
+            window_end = Date(year, 9, 30)
+        elif window == "year":
+            window_end = Date(current.year, 12, 31)
+        elif window == "month":
+            next_month = Date(current.year + current.month // 12, current.month % 12 + 1, 1)
+            window_end = next_month - timedelta(days=1)
+        elif window.isdigit() and int(window) > 0:
+            window_end = current + timedelta(days=int(window) - 1)
+        else:
+            raise ValueError(f"Unknown date window: {window}")
+
+        window_end = min(window_end, end_date)
+        windows.append((current, window_end))
+        current = window_end + timedelta(days=1)
+
+    return windows
 
 
 class WeatherStation(BaseModel):
@@ -69,6 +261,310 @@ class WeatherData(BaseModel):
     temp_min_attributes: Optional[str] = Field(default=None, alias="TMIN_ATTRIBUTES")
 
 
+_WEATHER_DATA_LIST = TypeAdapter(List[WeatherData])
+
+# Weather data as one list per WeatherData field, all of equal length
+WeatherColumns = Dict[str, List[Any]]
+
+_DECIMAL_FIELDS = {"precipitation", "snowfall", "snow_depth"}
+
+
+def _decimal_strings(values: List[Optional[Decimal]]) -> List[Optional[str]]:
+    """Render decimals as plain strings so they pickle compactly and load exactly"""
+    return [None if v is None else format(v, "f") for v in values]
+
+
+def weather_data_columns(data: List[WeatherData]) -> WeatherColumns:
+    """
+    Transpose weather data records into columns
+
+    Decimal fields become plain strings such as "0.3", every other field
+    keeps its validated type.
+
+    Args:
+        data: Weather data records
+
+    Returns:
+        One list per WeatherData field, in record order
+    """
+    columns: WeatherColumns = {}
+    for name in WeatherData.model_fields:
+        values = [getattr(record, name) for record in data]
+        columns[name] = _decimal_strings(values) if name in _DECIMAL_FIELDS else values
+    return columns
+
+
+def weather_data_records(columns: WeatherColumns) -> List[WeatherData]:
+    """
+    Transpose a columnar batch back into weather data records
+
+    The inverse of weather_data_columns. The columns are already validated,
+    so records are built without validating again.
+
+    Args:
+        columns: Weather data columns as built by weather_data_columns
+
+    Returns:
+        Weather data records in column order
+    """
+    values = [
+        [None if v is None else Decimal(v) for v in columns[name]]
+        if name in _DECIMAL_FIELDS
+        else columns[name]
+        for name in WeatherData.model_fields
+    ]
+    return [
+        WeatherData.model_construct(**dict(zip(WeatherData.model_fields, row, strict=True)))
+        for row in zip(*values, strict=True)
+    ]
+
+
+def column_rows(columns: WeatherColumns) -> int:
+    """Number of records in a columnar batch"""
+    return len(columns["station_id"])
+
+
+def first_dates(columns: WeatherColumns) -> Dict[str, Date]:
+    """Earliest date of each station in a columnar batch"""
+    firsts: Dict[str, Date] = {}
+    for station_id, day in zip(columns["station_id"], columns["date"], strict=True):
+        if station_id not in firsts or day < firsts[station_id]:
+            firsts[station_id] = day
+    return firsts
+
+
+def validate_weather_data(rows: List[Dict[str, Any]]) -> List[WeatherData]:
+    """
+    Validate a batch of response rows in a single pydantic call
+
+    Equivalent to WeatherData.model_validate on each row, including aliases
+    and ValidationError on bad input, without the per-row Python overhead.
+
+    Args:
+        rows: Response rows keyed by NOAA field name
+
+    Returns:
+        Validated weather data in the same order
+    """
+    return _WEATHER_DATA_LIST.validate_python(rows)
+
+
+# One adapter per WeatherData field, validating a whole column to the field's type
+_COLUMN_ADAPTERS: Dict[str, Tuple[str, TypeAdapter[List[Any]]]] = {
+    name: (field.alias or name, TypeAdapter(List[field.annotation]))  # type: ignore[name-defined]
+    for name, field in WeatherData.model_fields.items()
+}
+
+
+def _validate_decimal_column(
+    adapter: TypeAdapter[List[Any]], values: List[Any]
+) -> List[Optional[str]]:
+    """
+    Validate a decimal column and render it as plain strings
+
+    Measurements repeat heavily (most days have no snow), so each distinct
+    string is validated and formatted once and the results are mapped back.
+    A ValidationError then reports the position among the distinct values.
+    """
+    try:
+        distinct = list(dict.fromkeys(values))
+    except TypeError:  # unhashable input, which validation rejects below
+        distinct = []
+    # Only strings are deduplicated, as 1, 1.0 and True are equal keys
+    if len(distinct) == len(values) or not all(v is None or type(v) is str for v in distinct):
+        return _decimal_strings(adapter.validate_python(values))
+    rendered = dict(
+        zip(distinct, _decimal_strings(adapter.validate_python(distinct)), strict=True)
+    )
+    return [rendered[v] for v in values]
+
+
+def validate_weather_columns(rows: List[Dict[str, Any]]) -> WeatherColumns:
+    """
+    Validate response rows column by column into a columnar batch
+
+    Applies the WeatherData field types, raising ValidationError on bad
+    input, without creating an object per row. The result equals
+    weather_data_columns(validate_weather_data(rows)).
+
+    Args:
+        rows: Response rows keyed by NOAA field name
+
+    Returns:
+        One list per WeatherData field, in row order
+    """
+    columns: WeatherColumns = {}
+    for name, (alias, adapter) in _COLUMN_ADAPTERS.items():
+        values = [row.get(alias) for row in rows]
+        if name in _DECIMAL_FIELDS:
+            columns[name] = _validate_decimal_column(adapter, values)
+        else:
+            columns[name] = adapter.validate_python(values)
+    return columns
+
+
+def concat_columns(batches: List[WeatherColumns]) -> WeatherColumns:
+    """Combine columnar batches into one, in order"""
+    columns = weather_data_columns([])
+    for batch in batches:
+        for name, values in columns.items():
+            values.extend(batch[name])
+    return columns
+
+
+def _stations_from_rows(rows: List[Dict[str, Any]]) -> Dict[str, WeatherStation]:
+    """Validate station info from the first row of each station"""
+    stations: Dict[str, WeatherStation] = {}
+    for row in rows:
+        if row["STATION"] not in stations:
+            stations[row["STATION"]] = WeatherStation.model_validate(row)
+    return stations
+
+
+def parse_json_response(body: bytes) -> Tuple[List[WeatherData], Dict[str, WeatherStation]]:
+    """
+    Parse a daily-summaries JSON response
+
+    Args:
+        body: Raw JSON response body
+
+    Returns:
+        Weather data in response order, and station info keyed by station ID
+    """
+    data: List[Dict[str, Any]] = pydantic_core.from_json(body) if body.strip() else []
+    weather_data = validate_weather_data(data)
+    return weather_data, _stations_from_rows(data)
+
+
+def _csv_columns(body: bytes) -> Tuple[WeatherColumns, Dict[str, WeatherStation]]:
+    """
+    Read a CSV body into columns validated like the JSON path
+
+    Each column goes through the same per-field adapter as
+    validate_weather_columns, so values are accepted, converted and rejected
+    with ValidationError exactly as they are in JSON responses. Empty cells
+    count as missing, as NOAA omits empty values from JSON rows.
+    """
+    if not body.strip():
+        return {}, {}
+
+    frame = pd.read_csv(io.BytesIO(body), dtype=str, keep_default_na=False)
+    raw: Dict[str, List[Optional[str]]] = {
+        name: [v if v else None for v in frame[name].tolist()] for name in frame.columns
+    }
+    missing: List[Optional[str]] = [None] * len(frame)
+
+    data_columns: WeatherColumns = {
+        name: adapter.validate_python(raw.get(alias, missing))
+        for name, (alias, adapter) in _COLUMN_ADAPTERS.items()
+    }
+
+    stations: Dict[str, WeatherStation] = {}
+    station_aliases = [field.alias for field in WeatherStation.model_fields.values()]
+    for index, station_id in enumerate(raw.get("STATION", [])):
+        if station_id is not None and station_id not in stations:
+            stations[station_id] = WeatherStation.model_validate(
+                {alias: raw[alias][index] for alias in station_aliases if alias in raw}
+            )
+
+    return data_columns, stations
+
+
+def parse_csv_response(body: bytes) -> Tuple[List[WeatherData], Dict[str, WeatherStation]]:
+    """
+    Parse a daily-summaries CSV response column by column
+
+    The body is read into string columns in one pass and each column is
+    converted as a whole, skipping per-row dicts and per-row validation.
+    Results are equal to validating the JSON response for the same request.
+
+    Args:
+        body: Raw CSV response body
+
+    Returns:
+        Weather data in response order, and station info keyed by station ID
+    """
+    data_columns, stations = _csv_columns(body)
+    if not data_columns:
+        return [], stations
+
+    weather_data = [
+        WeatherData.model_construct(**dict(zip(data_columns, values, strict=True)))
+        for values in zip(*data_columns.values(), strict=True)
+    ]
+    return weather_data, stations
+
+
+def parse_response_columns(
+    body: bytes, response_format: str = "json"
+) -> Tuple[WeatherColumns, Dict[str, WeatherStation]]:
+    """
+    Parse and validate a daily-summaries response into a columnar batch
+
+    No per-row model is created: the result is a handful of lists of
+    strings, dates and ints, several times smaller than WeatherData models
+    and cheap to send back from a worker process.
+
+    Args:
+        body: Raw response body
+        response_format: "json" or "csv"
+
+    Returns:
+        Weather data columns as from weather_data_columns, and station info
+        keyed by station ID
+    """
+    if response_format == "csv":
+        columns, stations = _csv_columns(body)
+        for name in _DECIMAL_FIELDS & columns.keys():
+            columns[name] = _decimal_strings(columns[name])
+        return columns or weather_data_columns([]), stations
+
+    data: List[Dict[str, Any]] = pydantic_core.from_json(body) if body.strip() else []
+    return validate_weather_columns(data), _stations_from_rows(data)
+
+
+class TransportSettings(BaseModel):
+    """HTTP connection settings for NOAAClient"""
+
+    http2: bool = Field(
+        default=True,
+        description="Multiplex requests over HTTP/2 when the h2 package is installed",
+    )
+    max_connections: int = Field(default=4, description="Open connections to NOAA at most")
+    max_keepalive_connections: int = Field(default=4, description="Idle connections kept open")
+    keepalive_expiry: float = Field(
+        default=120.0, description="Seconds an idle connection lives"
+    )
+    connect_timeout: float = Field(
+        default=10.0, description="Seconds to establish a connection"
+    )
+    read_timeout: float = Field(default=60.0, description="Seconds to wait for response data")
+    accept_encoding: str = Field(
+        default="gzip, deflate", description="Response compression offered to NOAA"
+    )
+
+    def http2_enabled(self) -> bool:
+        """HTTP/2 if requested and supported by the installed packages"""
+        if self.http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requires the h2 package (httpx[http2]), using HTTP/1.1")
+            return False
+        return self.http2
+
+    def build_client(self) -> httpx.AsyncClient:
+        """Create an HTTP client with these settings"""
+        return httpx.AsyncClient(
+            http2=self.http2_enabled(),
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            # The rate limiter bounds concurrency, so waiting for a free connection is fine
+            timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout, pool=None),
+            headers={"Accept-Encoding": self.accept_encoding},
+        )
+
+
 class NOAAClient:
     """Client for NOAA's Climate Data API"""
 
@@ -78,13 +574,67 @@ class NOAAClient:
         timeout: float = 60.0,
         max_retries: int = 3,
         calls_per_minute: int = 5,
+        burst: int = 1,
+        rate_limiter: RateLimit | None = None,
+        response_format: str = "json",
+        cache: ResponseCache | None = None,
+        transport: TransportSettings | None = None,
     ):
+        """
+        Initialize client
+
+        Args:
+            base_url: NOAA data service endpoint
+            timeout: Read timeout in seconds, used when transport is not given
+            max_retries: Retries of transient failures per request
+            calls_per_minute: Request rate when rate_limiter is not given
+            burst: Requests allowed back to back when rate_limiter is not given
+            rate_limiter: Shared rate limiter
+            response_format: "json" or "csv"
+            cache: Response cache consulted before requesting
+            transport: Connection pool, HTTP/2, timeout and compression settings
+        """
+        if response_format not in ("json", "csv"):
+            raise ValueError(f"Unsupported response format: {response_format}")
         self.base_url = base_url
-        self.client = httpx.AsyncClient(timeout=timeout)
+        self.response_format = response_format
+        self.transport = transport or TransportSettings(read_timeout=timeout)
+        self.client = self.transport.build_client()
         self.max_retries = max_retries
-        self.rate_limiter = RateLimit(calls_per_minute)
+        self.rate_limiter = rate_limiter or RateLimit(calls_per_minute, burst)
+        self.cache = cache
+
+    async def _send(
+        self, params: Dict[str, Any], stream: bool, headers: Dict[str, str] | None
+    ) -> httpx.Response:
+        request = self.client.build_request(
+            "GET", self.base_url, params=params, headers=headers
+        )
+        response = await self.client.send(request, stream=stream)
+        not_modified = response.status_code == httpx.codes.NOT_MODIFIED
+        if stream and (response.is_error or not_modified):
+            await response.aclose()
+        if not not_modified:
+            response.raise_for_status()
+        return response
+
+    async def _make_request(
+        self,
+        params: Dict[str, Any],
+        stream: bool = False,
+        headers: Dict[str, str] | None = None,
+    ) -> httpx.Response:
+        """
+        Make a rate limited GET request, retrying transient failures
+
+        Args:
+            params: Query parameters
+            stream: Return before reading the body; the caller must close the response
+            headers: Extra request headers, such as conditional request validators
 
-    async def _make_request(self, params: Dict[str, Any]) -> httpx.Response:
+        Returns:
+            Successful response, or a 304 Not Modified response to a conditional request
+        """
         retry_count = 0
         last_exception: Exception | None = None
 
@@ -94,8 +644,8 @@ class NOAAClient:
                 await self.rate_limiter.wait()
 
                 # Make the request
-                response = await self.client.get(self.base_url, params=params)
-                response.raise_for_status()
+                response = await self._send(params, stream, headers)
+                self.rate_limiter.record_success()
                 return response
 
             except (RemoteProtocolError, ConnectError, TransportError) as e:
@@ -118,10 +668,12 @@ class NOAAClient:
                 if e.response.status_code == 429:
                     retry_count += 1
                     last_exception = e
+                    retry_after = parse_retry_after(e.response.headers.get("Retry-After"))
+                    self.rate_limiter.record_throttle(retry_after)
 
-                    # Rate limit hit - back off significantly
-                    wait_time = 30 * retry_count  # 30, 60, 90 seconds
-                    logger.warning(f"Rate limit hit, backing off for {wait_time}s")
+                    # Rate limit hit - back off as told, or significantly (30, 60, 90s)
+                    wait_time = retry_after if retry_after is not None else 30 * retry_count
+                    logger.warning(f"Rate limit hit, backing off for {wait_time:.0f}s")
                     await asyncio.sleep(wait_time)
 
                     # Continue to retry
@@ -132,6 +684,9 @@ class NOAAClient:
                 if 500 <= e.response.status_code < 600:
                     retry_count += 1
                     last_exception = e
+                    self.rate_limiter.record_throttle(
+                        parse_retry_after(e.response.headers.get("Retry-After"))
+                    )
 
                     if retry_count > self.max_retries:
                         break
@@ -152,30 +707,129 @@ class NOAAClient:
         # This should never happen, but just in case
         raise RuntimeError("Request failed with no exception")
 
-    async def get_station_data(
-        self, station_id: str, start_date: Date, end_date: Date
-    ) -> Tuple[List[WeatherData], Optional[WeatherStation]]:
-        params = {
+    @staticmethod
+    def _build_params(
+        station_ids: List[str], start_date: Date, end_date: Date, response_format: str = "json"
+    ) -> Dict[str, Any]:
+        return {
             "dataset": "daily-summaries",
-            "stations": station_id,
+            "stations": ",".join(station_ids),
             "startDate": start_date.isoformat(),
             "endDate": end_date.isoformat(),
             "dataTypes": "SNOW,PRCP,SNWD,TAVG,TMAX,TMIN",
             "includeStationLocation": "1",
             "includeStationName": "true",
             "includeAttributes": "true",
-            "format": "json",
+            "format": response_format,
         }
 
+    async def _cached_or_request(
+        self, params: Dict[str, Any], stream: bool = False
+    ) -> bytes | httpx.Response:
+        """
+        Get a body from the cache, revalidating a stale one with NOAA
+
+        A stale entry is requested with its ETag and Last-Modified validators,
+        and a 304 answer reuses the cached body without downloading it again.
+
+        Returns:
+            The cached body, or else the response with a new body to read and cache
+        """
+        if self.cache is None:
+            return await self._make_request(params, stream)
+        if (body := self.cache.get(params)) is not None:
+            return body
+
+        entry = self.cache.lookup(params)
+        headers = entry.conditional_headers() if entry is not None else None
+        response = await self._make_request(params, stream, headers)
+        if response.status_code != httpx.codes.NOT_MODIFIED:
+            return response
+        if (body := self.cache.revalidate(params)) is not None:
+            logger.debug(f"Not modified since last fetch: {params}")
+            return body
+        # The cached body disappeared since the lookup, so ask for it again
+        return await self._make_request(params, stream)
+
+    async def _fetch_body(self, params: Dict[str, Any]) -> bytes:
+        """Get a response body from the cache, or from NOAA and then cache it"""
+        response = await self._cached_or_request(params)
+        if isinstance(response, bytes):
+            return response
+
+        if self.cache is not None:
+            try:
+                self.cache.put(
+                    params,
+                    response.content,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
+            except OSError as e:
+                logger.warning(f"Failed to cache response: {str(e)}")
+        return response.content
+
+    async def _stream_body(self, params: Dict[str, Any]) -> AsyncIterator[bytes]:
+        """Yield a response body in chunks, caching it as it streams in"""
+        response = await self._cached_or_request(params, stream=True)
+        if isinstance(response, bytes):
+            yield response
+            return
+
+        writer = None
+        if self.cache is not None:
+            writer = self.cache.writer(
+                params,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
         try:
-            response = await self._make_request(params)
-            data = response.json()
+            async for chunk in response.aiter_bytes():
+                if writer is not None:
+                    writer.write(chunk)
+                yield chunk
+            if writer is not None:
+                writer.commit()
+        finally:
+            if writer is not None:
+                writer.discard()
+            await response.aclose()
 
-            if not data:
+    def parse_body(self, body: bytes) -> Tuple[List[WeatherData], Dict[str, WeatherStation]]:
+        """Parse a raw response body in the client's format"""
+        if self.response_format == "csv":
+            return parse_csv_response(body)
+        return parse_json_response(body)
+
+    async def fetch_raw(
+        self, station_ids: List[str], start_date: Date, end_date: Date
+    ) -> bytes:
+        """
+        Fetch the unparsed response body for one or more stations
+
+        Args:
+            station_ids: NOAA station IDs
+            start_date: First date to fetch
+            end_date: Last date to fetch
+
+        Returns:
+            Raw response body in the client's response format
+        """
+        params = self._build_params(station_ids, start_date, end_date, self.response_format)
+        return await self._fetch_body(params)
+
+    async def get_station_data(
+        self, station_id: str, start_date: Date, end_date: Date
+    ) -> Tuple[List[WeatherData], Optional[WeatherStation]]:
+        params = self._build_params([station_id], start_date, end_date, self.response_format)
+
+        try:
+            weather_data, stations = self.parse_body(await self._fetch_body(params))
+
+            if not weather_data:
                 return [], None
 
-            weather_data = [WeatherData.model_validate(row) for row in data]
-            station_info = WeatherStation.model_validate(data[0]) if data else None
+            station_info = stations.get(station_id) or next(iter(stations.values()), None)
 
             return weather_data, station_info
 
@@ -183,16 +837,242 @@ class NOAAClient:
             logger.error(f"Failed to fetch data for station {station_id}: {str(e)}")
             raise
 
+    async def stream_station_data(
+        self, station_id: str, start_date: Date, end_date: Date, batch_size: int = 5000
+    ) -> AsyncIterator[Tuple[List[WeatherData], Optional[WeatherStation]]]:
+        """
+        Stream a station's data in validated batches as the response arrives
+
+        The response body is parsed incrementally, so memory stays bounded by
+        batch_size regardless of the date range. Streaming always reads JSON,
+        so it raises ValueError on a client configured for CSV.
+
+        Args:
+            station_id: NOAA station ID
+            start_date: First date to fetch
+            end_date: Last date to fetch
+            batch_size: Number of records per yielded batch
+
+        Yields:
+            Batches of weather data in response order, with the station info
+        """
+        if self.response_format != "json":
+            raise ValueError(f"Streaming only supports JSON, not {self.response_format}")
+        params = self._build_params([station_id], start_date, end_date)
+
+        try:
+            station_info: Optional[WeatherStation] = None
+            rows: List[Dict[str, Any]] = []
+            async for row in iter_json_array(self._stream_body(params)):
+                if station_info is None:
+                    station_info = WeatherStation.model_validate(row)
+                rows.append(row)
+                if len(rows) >= batch_size:
+                    yield validate_weather_data(rows), station_info
+                    rows = []
+            if rows:
+                yield validate_weather_data(rows), station_info
+
+        except Exception as e:
+            logger.error(f"Failed to stream data for station {station_id}: {str(e)}")
+            raise
+
+    async def get_stations_data(
+        self,
+        station_ids: List[str],
+        start_date: Date,
+        end_date: Date,
+        batch_size: int = 10,
+        max_bytes: int = 50_000_000,
+        row_bytes: int = 400,
+    ) -> Dict[str, Tuple[List[WeatherData], Optional[WeatherStation]]]:
+        """
+        Fetch several stations per request and split the response by station
+
+        Batches are fetched by get_stations_columns and transposed into records.
+
+        Args:
+            station_ids: NOAA station IDs
+            start_date: First date to fetch
+            end_date: Last date to fetch
+            batch_size: Maximum number of stations per request
+            max_bytes: Approximate response size budget per request
+            row_bytes: Estimated response bytes per station-day, used with max_bytes
+
+        Returns:
+            Weather data and station info keyed by station ID. Stations without
+            data map to an empty list and None
+        """
+        columns, stations = await self.get_stations_columns(
+            station_ids, start_date, end_date, batch_size, max_bytes, row_bytes
+        )
+
+        records: Dict[str, List[WeatherData]] = {station_id: [] for station_id in station_ids}
+        for record in weather_data_records(columns):
+            records.setdefault(record.station_id, []).append(record)
+        for station_id in stations:
+            records.setdefault(station_id, [])
+
+        return {
+            station_id: (sorted(weather_data, key=lambda r: r.date), stations.get(station_id))
+            for station_id, weather_data in records.items()
+        }
+
+    async def get_station_data_chunked(
+        self,
+        station_id: str,
+        start_date: Date,
+        end_date: Date,
+        window: str = "water_year",
+        chunk_retries: int = 2,
+    ) -> Tuple[List[WeatherData], Optional[WeatherStation]]:
+        """
+        Fetch a station's date range as concurrent windowed requests
+
+        Each window shares the client's rate limiter and is retried on its own,
+        so a failure late in a long range doesn't throw away the earlier windows.
+        Windows are fetched by get_station_columns and transposed into records.
+
+        Args:
+            station_id: NOAA station ID
+            start_date: First date to fetch
+            end_date: Last date to fetch
+            window: Window size passed to split_date_range
+            chunk_retries: Extra attempts for a window after its first failure
+
+        Returns:
+            Weather data for the whole range in date order, and station info
+        """
+        columns, station_info = await self.get_station_columns(
+            station_id, start_date, end_date, window, chunk_retries
+        )
+        records = {record.date: record for record in weather_data_records(columns)}
+        return [records[d] for d in sorted(records)], station_info
+
+    async def fetch_columns(
+        self, station_ids: List[str], start_date: Date, end_date: Date
+    ) -> Tuple[WeatherColumns, Dict[str, WeatherStation]]:
+        """
+        Fetch one or more stations as a columnar batch
+
+        Args:
+            station_ids: NOAA station IDs
+            start_date: First date to fetch
+            end_date: Last date to fetch
+
+        Returns:
+            Weather data columns in response order, and station info keyed by station ID
+        """
+        body = await self.fetch_raw(station_ids, start_date, end_date)
+        return parse_response_columns(body, self.response_format)
+
+    async def get_station_columns(
+        self,
+        station_id: str,
+        start_date: Date,
+        end_date: Date,
+        window: str | None = None,
+        chunk_retries: int = 2,
+    ) -> Tuple[WeatherColumns, Optional[WeatherStation]]:
+        """
+        Fetch a station's date range as a columnar batch
+
+        With a window, each window is its own request and is retried on its
+        own. Records are never materialized as models.
+
+        Args:
+            station_id: NOAA station ID
+            start_date: First date to fetch
+            end_date: Last date to fetch
+            window: Optional window size passed to split_date_range
+            chunk_retries: Extra attempts for a window after its first failure
+
+        Returns:
+            Weather data columns in window order, and station info
+        """
+        windows = (
+            split_date_range(start_date, end_date, window)
+            if window
+            else [(start_date, end_date)]
+        )
+
+        async def fetch_window(
+            window_start: Date, window_end: Date
+        ) -> Tuple[WeatherColumns, Dict[str, WeatherStation]]:
+            attempt = 0
+            while True:
+                try:
+                    return await self.fetch_columns([station_id], window_start, window_end)
+                except Exception as e:
+                    attempt += 1
+                    if attempt > chunk_retries:
+                        logger.error(
+                            f"Failed to fetch data for station {station_id}: {str(e)}"
+                        )
+                        raise
+                    logger.warning(
+                        f"Chunk {window_start} to {window_end} for {station_id} failed, "
+                        f"retrying (attempt {attempt}/{chunk_retries}): {str(e)}"
+                    )
+
+        results = await asyncio.gather(*(fetch_window(s, e) for s, e in windows))
+
+        station_info = next(
+            (stations.get(station_id) for _, stations in results if station_id in stations),
+            None,
+        )
+        return concat_columns([columns for columns, _ in results]), station_info
+
+    async def get_stations_columns(
+        self,
+        station_ids: List[str],
+        start_date: Date,
+        end_date: Date,
+        batch_size: int = 10,
+        max_bytes: int = 50_000_000,
+        row_bytes: int = 400,
+    ) -> Tuple[WeatherColumns, Dict[str, WeatherStation]]:
+        """
+        Fetch several stations per request as one columnar batch
+
+        Args:
+            station_ids: NOAA station IDs
+            start_date: First date to fetch
+            end_date: Last date to fetch
+            batch_size: Maximum number of stations per request
+            max_bytes: Approximate response size budget per request
+            row_bytes: Estimated response bytes per station-day, used with max_bytes
+
+        Returns:
+            Weather data columns of all stations, and station info keyed by station ID
+        """
+        batches = _station_batches(
+            station_ids, start_date, end_date, batch_size, max_bytes, row_bytes
+        )
+
+        async def fetch_batch(
+            batch: List[str],
+        ) -> Tuple[WeatherColumns, Dict[str, WeatherStation]]:
+            try:
+                return await self.fetch_columns(batch, start_date, end_date)
+            except Exception as e:
+                logger.error(f"Failed to fetch data for stations {','.join(batch)}: {str(e)}")
+                raise
+
+        results = await asyncio.gather(*(fetch_batch(b) for b in batches))
+
+        stations: Dict[str, WeatherStation] = {}
+        for _, batch_stations in results:
+            stations.update(batch_stations)
+        return concat_columns([columns for columns, _ in results]), stations
+
     async def get_all_stations_data(
         self, config: StationConfig
     ) -> List[Tuple[List[WeatherData], Optional[WeatherStation]]]:
-        results: List[Tuple[List[WeatherData], Optional[WeatherStation]]] = []
-        for station_id in config.stations:
-            station_data = await self.get_station_data(
-                station_id, config.start_date, config.end_date
-            )
-            results.append(station_data)
-        return results
+        results = await self.get_stations_data(
+            list(config.stations), config.start_date, config.end_date
+        )
+        return [results[station_id] for station_id in config.stations]
 
     async def close(self) -> None:
         """Close the HTTP client session"""
@@ -208,3 +1088,20 @@ class NOAAClient:
         exc_tb: types.TracebackType | None,
     ) -> None:
         await self.close()
+
+
+def _station_batches(
+    station_ids: List[str],
+    start_date: Date,
+    end_date: Date,
+    batch_size: int,
+    max_bytes: int,
+    row_bytes: int,
+) -> List[List[str]]:
+    """Group stations into requests that stay within batch_size and the size budget"""
+    days = (end_date - start_date).days + 1
+    stations_per_request = max(1, min(batch_size, max_bytes // max(1, days * row_bytes)))
+    return [
+        station_ids[i : i + stations_per_request]
+        for i in range(0, len(station_ids), stations_per_request)
+    ]
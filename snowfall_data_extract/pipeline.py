@@ -0,0 +1,286 @@
+import asyncio
+import functools
+import logging
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from .db import JobRecord
+from .noaa import (
+    NOAAClient,
+    WeatherColumns,
+    WeatherStation,
+    column_rows,
+    first_dates,
+    parse_response_columns,
+)
+from .writer import DatabaseWriter
+
+logger = logging.getLogger(__name__)
+
+FetchJob = Tuple[List[str], date, date]
+ParsedBody = Tuple[WeatherColumns, Dict[str, WeatherStation]]
+
+
+class StageStats(BaseModel):
+    """Throughput and backlog counters for one pipeline stage"""
+
+    name: str
+    workers: int
+    items: int = 0
+    rows: int = 0
+    failures: int = 0
+    busy_seconds: float = 0.0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+
+    @property
+    def items_per_second(self) -> float:
+        """Items completed per second of worker time"""
+        return self.items / self.busy_seconds if self.busy_seconds else 0.0
+
+    def observe_queue(self, depth: int) -> None:
+        self.queue_depth = depth
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+
+
+class PipelineResult(BaseModel):
+    """Outcome of a pipeline run"""
+
+    stats: List[StageStats]
+    failed_jobs: List[str]
+    elapsed: float
+
+
+def format_stats(stats: List[StageStats]) -> str:
+    """
+    Build a one-line-per-stage report of pipeline throughput
+
+    Args:
+        stats: Stage statistics in pipeline order
+
+    Returns:
+        Multi-line report
+    """
+    return "\n".join(
+        f"{s.name:<6} workers={s.workers} items={s.items} rows={s.rows} "
+        f"failures={s.failures} busy={s.busy_seconds:.1f}s "
+        f"rate={s.items_per_second:.2f}/s queue={s.queue_depth} (max {s.max_queue_depth})"
+        for s in stats
+    )
+
+
+class IngestPipeline:
+    """
+    Fetch, parse and load as independent stages connected by bounded queues
+
+    Fetching runs as concurrent coroutines sharing the client's rate limiter,
+    parsing and validation of raw bodies runs in an executor (a process pool
+    by default) that returns columnar batches, and loading goes through the
+    single DatabaseWriter. Each
+    stage has its own worker count and queue, so the slowest stage shows up
+    as a full queue in front of it.
+    """
+
+    def __init__(
+        self,
+        client: NOAAClient,
+        writer: DatabaseWriter,
+        fetch_workers: int = 4,
+        parse_workers: int = 2,
+        queue_size: int = 8,
+        executor: Executor | None = None,
+        report_interval: float = 30.0,
+    ):
+        """
+        Initialize pipeline
+
+        Args:
+            client: NOAA client used by the fetch stage
+            writer: Database writer used by the load stage
+            fetch_workers: Concurrent requests in the fetch stage
+            parse_workers: Concurrent parse jobs, and process pool size
+            queue_size: Capacity of the queues between stages
+            executor: Executor for parsing; a spawning ProcessPoolExecutor is created if None
+            report_interval: Seconds between progress log lines, 0 to disable
+        """
+        self.client = client
+        self.writer = writer
+        self.queue_size = queue_size
+        self.executor = executor
+        self.report_interval = report_interval
+        self.fetch_stats = StageStats(name="fetch", workers=fetch_workers)
+        self.parse_stats = StageStats(name="parse", workers=parse_workers)
+        self.load_stats = StageStats(name="load", workers=1)
+        self.failed_jobs: List[str] = []
+
+    @property
+    def stats(self) -> List[StageStats]:
+        return [self.fetch_stats, self.parse_stats, self.load_stats]
+
+    def _parser(self) -> Callable[[bytes], ParsedBody]:
+        # A partial of a module-level function pickles, so it works with process pools
+        return functools.partial(
+            parse_response_columns, response_format=self.client.response_format
+        )
+
+    async def _job_failed(
+        self, stats: StageStats, record: JobRecord, error: Exception
+    ) -> None:
+        name = f"{','.join(record.station_ids)} {record.start_date}..{record.end_date}"
+        stats.failures += 1
+        self.failed_jobs.append(name)
+        logger.error(f"{stats.name} failed for {name}: {str(error)}")
+
+        record.status = "failed"
+        record.error = str(error)
+        try:
+            await self.writer.record_jobs([record])
+        except RuntimeError:
+            pass  # the writer itself failed, so the job simply stays unfinished
+
+    async def _fetch_worker(
+        self,
+        jobs: "asyncio.Queue[FetchJob]",
+        parse_queue: "asyncio.Queue[Optional[Tuple[JobRecord, bytes]]]",
+    ) -> None:
+        while not jobs.empty():
+            station_ids, start_date, end_date = jobs.get_nowait()
+            record = JobRecord(
+                station_ids=station_ids, start_date=start_date, end_date=end_date
+            )
+            self.fetch_stats.observe_queue(jobs.qsize())
+            start = time.perf_counter()
+            try:
+                body = await self.client.fetch_raw(station_ids, start_date, end_date)
+            except Exception as e:
+                record.duration += time.perf_counter() - start
+                await self._job_failed(self.fetch_stats, record, e)
+                continue
+            finally:
+                self.fetch_stats.busy_seconds += time.perf_counter() - start
+            record.duration += time.perf_counter() - start
+            record.response_bytes = len(body)
+            self.fetch_stats.items += 1
+            await parse_queue.put((record, body))
+            self.parse_stats.observe_queue(parse_queue.qsize())
+
+    async def _parse_worker(
+        self,
+        executor: Executor,
+        parse_queue: "asyncio.Queue[Optional[Tuple[JobRecord, bytes]]]",
+        load_queue: "asyncio.Queue[Optional[Tuple[JobRecord, ParsedBody]]]",
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        parser = self._parser()
+        while (item := await parse_queue.get()) is not None:
+            record, body = item
+            start = time.perf_counter()
+            try:
+                parsed = await loop.run_in_executor(executor, parser, body)
+            except Exception as e:
+                record.duration += time.perf_counter() - start
+                await self._job_failed(self.parse_stats, record, e)
+                continue
+            finally:
+                self.parse_stats.busy_seconds += time.perf_counter() - start
+            record.duration += time.perf_counter() - start
+            self.parse_stats.items += 1
+            self.parse_stats.rows += column_rows(parsed[0])
+            await load_queue.put((record, parsed))
+            self.load_stats.observe_queue(load_queue.qsize())
+
+    async def _load_worker(
+        self, load_queue: "asyncio.Queue[Optional[Tuple[JobRecord, ParsedBody]]]"
+    ) -> None:
+        while (item := await load_queue.get()) is not None:
+            record, (columns, stations) = item
+            start = time.perf_counter()
+            record.first_dates = first_dates(columns)
+            try:
+                # The ledger marks the job done in the same transaction as its data
+                await self.writer.write_columns(list(stations.values()), columns, [record])
+            except Exception as e:
+                # Keep draining so upstream stages never block on a full queue
+                await self._job_failed(self.load_stats, record, e)
+                continue
+            finally:
+                self.load_stats.busy_seconds += time.perf_counter() - start
+            self.load_stats.items += 1
+            self.load_stats.rows += column_rows(columns)
+
+    async def _report(self) -> None:
+        while True:
+            await asyncio.sleep(self.report_interval)
+            logger.info("Pipeline progress\n" + format_stats(self.stats))
+
+    async def run(self, jobs: List[FetchJob]) -> PipelineResult:
+        """
+        Run all jobs through the pipeline
+
+        A failed job is recorded and skipped; the rest keep flowing.
+
+        Args:
+            jobs: (station IDs, start date, end date) requests to fetch
+
+        Returns:
+            Stage statistics, failed jobs and wall-clock time
+        """
+        started = time.perf_counter()
+        job_queue: asyncio.Queue[FetchJob] = asyncio.Queue()
+        parse_queue: asyncio.Queue[Optional[Tuple[JobRecord, bytes]]] = asyncio.Queue(
+            self.queue_size
+        )
+        load_queue: asyncio.Queue[Optional[Tuple[JobRecord, ParsedBody]]] = asyncio.Queue(
+            self.queue_size
+        )
+
+        for job in jobs:
+            job_queue.put_nowait(job)
+
+        # Spawned, not forked: forking copies the event loop, the writer thread
+        # and any locks they hold into the children
+        executor = self.executor or ProcessPoolExecutor(
+            self.parse_stats.workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        reporter = asyncio.create_task(self._report()) if self.report_interval > 0 else None
+        try:
+            fetchers = [
+                asyncio.create_task(self._fetch_worker(job_queue, parse_queue))
+                for _ in range(self.fetch_stats.workers)
+            ]
+            parsers = [
+                asyncio.create_task(self._parse_worker(executor, parse_queue, load_queue))
+                for _ in range(self.parse_stats.workers)
+            ]
+            loader = asyncio.create_task(self._load_worker(load_queue))
+
+            await _finish(fetchers, parse_queue, self.parse_stats.workers)
+            await _finish(parsers, load_queue, 1)
+            await loader
+        finally:
+            if reporter is not None:
+                reporter.cancel()
+            if self.executor is None:
+                executor.shutdown(cancel_futures=True)
+
+        for stats in self.stats:
+            stats.queue_depth = 0
+        return PipelineResult(
+            stats=self.stats,
+            failed_jobs=self.failed_jobs,
+            elapsed=time.perf_counter() - started,
+        )
+
+
+async def _finish(
+    workers: List["asyncio.Task[None]"], next_queue: "asyncio.Queue[Any]", consumers: int
+) -> None:
+    """Wait for a stage's workers, then tell the next stage's workers to stop"""
+    await asyncio.gather(*workers)
+    for _ in range(consumers):
+        await next_queue.put(None)
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import time
+from datetime import date
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+
+class TaskResult(BaseModel):
+    """Outcome of a single scheduled task"""
+
+    name: str
+    succeeded: bool
+    elapsed: float
+    error: Optional[str] = None
+
+
+class StationScheduler:
+    """Runs station tasks with a bounded number in flight, isolating failures"""
+
+    def __init__(self, max_in_flight: int = 4):
+        """
+        Initialize scheduler
+
+        Args:
+            max_in_flight: Maximum number of tasks running at the same time
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        self.max_in_flight = max_in_flight
+
+    async def run(
+        self, names: List[str], task: Callable[[str], Awaitable[None]]
+    ) -> List[TaskResult]:
+        """
+        Run a task for each name, starting them in the given order
+
+        A failing task is recorded and does not cancel the others.
+
+        Args:
+            names: Task names (station IDs) in priority order
+            task: Coroutine function called with each name
+
+        Returns:
+            One result per name, in the same order as names
+        """
+        queue: asyncio.Queue[int] = asyncio.Queue()
+        for index in range(len(names)):
+            queue.put_nowait(index)
+        results: List[Optional[TaskResult]] = [None] * len(names)
+
+        async def worker() -> None:
+            while not queue.empty():
+                index = queue.get_nowait()
+                name = names[index]
+                start = time.perf_counter()
+                try:
+                    await task(name)
+                    results[index] = TaskResult(
+                        name=name, succeeded=True, elapsed=time.perf_counter() - start
+                    )
+                except Exception as e:
+                    results[index] = TaskResult(
+                        name=name,
+                        succeeded=False,
+                        elapsed=time.perf_counter() - start,
+                        error=str(e) or type(e).__name__,
+                    )
+
+        await asyncio.gather(*(worker() for _ in range(min(self.max_in_flight, len(names)))))
+        return [result for result in results if result is not None]
+
+
+def oldest_first(last_dates: Dict[str, Optional[date]]) -> List[str]:
+    """
+    Order stations so those never fetched come first, then oldest data first
+
+    Args:
+        last_dates: Last stored date keyed by station ID
+
+    Returns:
+        Station IDs in fetch priority order
+    """
+    return sorted(
+        last_dates, key=lambda s: (last_dates[s] is not None, last_dates[s] or date.min)
+    )
+
+
+def format_summary(results: List[TaskResult]) -> str:
+    """
+    Build a human readable summary of scheduled task results
+
+    Args:
+        results: Task results from StationScheduler.run
+
+    Returns:
+        Multi-line summary with counts, timings and failures
+    """
+    succeeded = [r for r in results if r.succeeded]
+    failed = [r for r in results if not r.succeeded]
+    total = sum(r.elapsed for r in results)
+
+    lines = [
+        f"Stations: {len(results)} total, {len(succeeded)} succeeded, {len(failed)} failed",
+        f"Task time: {total:.1f}s total, "
+        f"{max((r.elapsed for r in results), default=0.0):.1f}s slowest",
+    ]
+    for result in failed:
+        lines.append(f"  FAILED {result.name} after {result.elapsed:.1f}s: {result.error}")
+    return "\n".join(lines)
@@ -0,0 +1,3 @@
+SELECT change, COUNT(*)
+FROM weather_station_staging
+GROUP BY change
@@ -0,0 +1,2 @@
+DELETE FROM lake_superseded_file
+WHERE file_name = ?;
@@ -0,0 +1,3 @@
+INSERT INTO fetch_job (station_ids, start_date, end_date, position)
+SELECT station_ids, start_date, end_date, position
+FROM fetch_job_plan;
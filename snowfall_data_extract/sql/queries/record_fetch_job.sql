@@ -0,0 +1,17 @@
+INSERT INTO fetch_job (
+    station_ids,
+    start_date,
+    end_date,
+    status,
+    attempts,
+    response_bytes,
+    duration,
+    error
+) VALUES (?, ?, ?, ?, 1, ?, ?, ?)
+ON CONFLICT (station_ids, start_date, end_date) DO UPDATE SET
+    status = excluded.status,
+    attempts = fetch_job.attempts + 1,
+    response_bytes = excluded.response_bytes,
+    duration = excluded.duration,
+    error = excluded.error,
+    updated_at = now();
@@ -0,0 +1,3 @@
+INSERT INTO lake_superseded_file (file_name)
+VALUES (?)
+ON CONFLICT (file_name) DO NOTHING;
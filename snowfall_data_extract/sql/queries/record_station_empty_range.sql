@@ -0,0 +1,4 @@
+INSERT INTO station_empty_range (station_id, start_date, end_date)
+VALUES (?, ?, ?)
+ON CONFLICT (station_id, start_date) DO UPDATE SET
+    end_date = greatest(station_empty_range.end_date, excluded.end_date);
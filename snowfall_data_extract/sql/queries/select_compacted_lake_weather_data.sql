@@ -0,0 +1,4 @@
+SELECT *
+FROM read_parquet(?)
+QUALIFY ROW_NUMBER() OVER (PARTITION BY station_id, date ORDER BY loaded_seq DESC) = 1
+ORDER BY station_id, date
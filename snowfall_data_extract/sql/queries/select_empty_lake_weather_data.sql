@@ -0,0 +1,16 @@
+SELECT
+    CAST(NULL AS VARCHAR) AS station_id,
+    CAST(NULL AS DATE) AS date,
+    CAST(NULL AS DECIMAL) AS precipitation,
+    CAST(NULL AS VARCHAR) AS precipitation_attributes,
+    CAST(NULL AS DECIMAL) AS snowfall,
+    CAST(NULL AS VARCHAR) AS snowfall_attributes,
+    CAST(NULL AS DECIMAL) AS snow_depth,
+    CAST(NULL AS VARCHAR) AS snow_depth_attributes,
+    CAST(NULL AS INTEGER) AS temp_max,
+    CAST(NULL AS VARCHAR) AS temp_max_attributes,
+    CAST(NULL AS INTEGER) AS temp_min,
+    CAST(NULL AS VARCHAR) AS temp_min_attributes,
+    CAST(NULL AS UBIGINT) AS row_hash,
+    CAST(NULL AS BIGINT) AS loaded_seq
+WHERE false
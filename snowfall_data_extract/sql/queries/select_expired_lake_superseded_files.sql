@@ -0,0 +1,4 @@
+SELECT file_name
+FROM lake_superseded_file
+WHERE superseded_at <= now() - to_seconds(?)
+ORDER BY file_name;
@@ -0,0 +1,28 @@
+SELECT
+    station_id,
+    CAST(year(date) AS INTEGER) AS year,
+    COUNT(*) AS row_count,
+    -- Order-independent digest of the partition's rows
+    bit_xor(
+        hash(
+            date,
+            COALESCE(
+                row_hash,
+                hash(
+                    precipitation,
+                    precipitation_attributes,
+                    snowfall,
+                    snowfall_attributes,
+                    snow_depth,
+                    snow_depth_attributes,
+                    temp_max,
+                    temp_max_attributes,
+                    temp_min,
+                    temp_min_attributes
+                )
+            )
+        )
+    ) AS fingerprint
+FROM weather_data
+GROUP BY station_id, year
+ORDER BY station_id, year
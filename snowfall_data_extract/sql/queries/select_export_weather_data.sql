@@ -0,0 +1,20 @@
+SELECT
+    weather_data.station_id,
+    CAST(year(weather_data.date) AS INTEGER) AS year,
+    weather_data.date,
+    weather_data.precipitation,
+    weather_data.precipitation_attributes,
+    weather_data.snowfall,
+    weather_data.snowfall_attributes,
+    weather_data.snow_depth,
+    weather_data.snow_depth_attributes,
+    weather_data.temp_max,
+    weather_data.temp_max_attributes,
+    weather_data.temp_min,
+    weather_data.temp_min_attributes
+FROM weather_data
+INNER JOIN export_partitions
+    ON
+        weather_data.station_id = export_partitions.station_id
+        AND year(weather_data.date) = export_partitions.year
+ORDER BY weather_data.station_id, weather_data.date
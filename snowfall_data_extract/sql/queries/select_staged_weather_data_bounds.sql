@@ -0,0 +1,5 @@
+SELECT
+    MIN(date),
+    MAX(date),
+    LIST(DISTINCT station_id)
+FROM weather_data_staging
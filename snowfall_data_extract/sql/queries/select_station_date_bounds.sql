@@ -0,0 +1,7 @@
+SELECT
+    MIN(date) AS first_date,
+    MAX(date) AS last_date
+FROM weather_data
+WHERE
+    station_id = ?
+    AND date BETWEEN ? AND ?
@@ -0,0 +1,16 @@
+WITH station_dates AS (
+    SELECT
+        date,
+        LAG(date) OVER (ORDER BY date) AS prev_date
+    FROM weather_data
+    WHERE
+        station_id = ?
+        AND date BETWEEN ? AND ?
+)
+
+SELECT
+    prev_date + 1 AS gap_start,
+    date - 1 AS gap_end
+FROM station_dates
+WHERE date - prev_date > ?
+ORDER BY gap_start
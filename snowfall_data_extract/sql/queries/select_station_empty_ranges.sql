@@ -0,0 +1,9 @@
+SELECT
+    start_date,
+    end_date
+FROM station_empty_range
+WHERE
+    station_id = ?
+    AND start_date <= ?
+    AND end_date >= ?
+ORDER BY start_date
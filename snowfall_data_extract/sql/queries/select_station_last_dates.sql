@@ -0,0 +1,5 @@
+SELECT
+    station_id,
+    MAX(date) AS last_date
+FROM weather_data
+GROUP BY station_id
@@ -0,0 +1,4 @@
+SELECT station_ids, start_date, end_date
+FROM fetch_job
+WHERE status <> 'done'
+ORDER BY position NULLS LAST, station_ids, start_date;
@@ -0,0 +1,31 @@
+-- Cast to the types of the seed file so every lake file has the same schema
+CREATE OR REPLACE TEMP TABLE weather_data_append AS
+SELECT
+    CAST(staged.station_id AS VARCHAR) AS station_id,
+    CAST(staged.date AS DATE) AS date,
+    CAST(staged.precipitation AS DECIMAL) AS precipitation,
+    CAST(staged.precipitation_attributes AS VARCHAR) AS precipitation_attributes,
+    CAST(staged.snowfall AS DECIMAL) AS snowfall,
+    CAST(staged.snowfall_attributes AS VARCHAR) AS snowfall_attributes,
+    CAST(staged.snow_depth AS DECIMAL) AS snow_depth,
+    CAST(staged.snow_depth_attributes AS VARCHAR) AS snow_depth_attributes,
+    CAST(staged.temp_max AS INTEGER) AS temp_max,
+    CAST(staged.temp_max_attributes AS VARCHAR) AS temp_max_attributes,
+    CAST(staged.temp_min AS INTEGER) AS temp_min,
+    CAST(staged.temp_min_attributes AS VARCHAR) AS temp_min_attributes,
+    CAST(staged.row_hash AS UBIGINT) AS row_hash,
+    CAST(? AS BIGINT) AS loaded_seq
+FROM weather_data_staging AS staged
+-- Constant bounds let the filter reach the Parquet scan and skip row groups
+LEFT JOIN (
+    SELECT
+        station_id,
+        date,
+        row_hash
+    FROM weather_data
+    WHERE date BETWEEN ? AND ? AND list_contains(?, station_id)
+) AS stored
+    ON stored.station_id = staged.station_id AND stored.date = staged.date
+-- Rows whose values are unchanged are not appended at all
+WHERE stored.row_hash IS DISTINCT FROM staged.row_hash
+ORDER BY staged.station_id, staged.date
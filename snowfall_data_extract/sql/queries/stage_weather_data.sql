@@ -0,0 +1,35 @@
+CREATE OR REPLACE TEMP TABLE weather_data_staging AS
+SELECT
+    *,
+    CAST(hash(
+        precipitation,
+        precipitation_attributes,
+        snowfall,
+        snowfall_attributes,
+        snow_depth,
+        snow_depth_attributes,
+        temp_max,
+        temp_max_attributes,
+        temp_min,
+        temp_min_attributes
+    ) AS UBIGINT) AS row_hash
+FROM (
+    -- Every column is cast to its stored type: pandas hands an all-NULL
+    -- column over as INTEGER, which would otherwise change the hash and the
+    -- schema of lake files
+    SELECT
+        CAST(station_id AS VARCHAR) AS station_id,
+        CAST(date AS DATE) AS date,
+        CAST(precipitation AS DECIMAL) AS precipitation,
+        CAST(precipitation_attributes AS VARCHAR) AS precipitation_attributes,
+        CAST(snowfall AS DECIMAL) AS snowfall,
+        CAST(snowfall_attributes AS VARCHAR) AS snowfall_attributes,
+        CAST(snow_depth AS DECIMAL) AS snow_depth,
+        CAST(snow_depth_attributes AS VARCHAR) AS snow_depth_attributes,
+        CAST(temp_max AS INTEGER) AS temp_max,
+        CAST(temp_max_attributes AS VARCHAR) AS temp_max_attributes,
+        CAST(temp_min AS INTEGER) AS temp_min,
+        CAST(temp_min_attributes AS VARCHAR) AS temp_min_attributes
+    FROM weather_data_batch
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY station_id, date ORDER BY batch_row DESC) = 1
+)
@@ -0,0 +1,23 @@
+CREATE OR REPLACE TEMP TABLE weather_station_staging AS
+WITH batch AS (
+    SELECT
+        station_id,
+        station_name,
+        CAST(latitude AS DECIMAL) AS latitude,
+        CAST(longitude AS DECIMAL) AS longitude,
+        CAST(elevation AS DECIMAL) AS elevation
+    FROM weather_station_batch
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY station_id ORDER BY batch_row DESC) = 1
+)
+SELECT
+    batch.*,
+    CASE
+        WHEN existing.station_id IS NULL THEN 'inserted'
+        WHEN batch.station_name IS DISTINCT FROM existing.station_name
+            OR batch.latitude IS DISTINCT FROM existing.latitude
+            OR batch.longitude IS DISTINCT FROM existing.longitude
+            OR batch.elevation IS DISTINCT FROM existing.elevation THEN 'updated'
+        ELSE 'unchanged'
+    END AS change
+FROM batch
+LEFT JOIN weather_station AS existing ON existing.station_id = batch.station_id
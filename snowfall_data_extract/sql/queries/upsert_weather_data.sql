@@ -1,4 +1,4 @@
-INSERT OR REPLACE INTO weather_data (
+INSERT INTO weather_data (
     station_id,
     date,
     precipitation,
@@ -10,5 +10,37 @@ INSERT OR REPLACE INTO weather_data (
     temp_max,
     temp_max_attributes,
     temp_min,
-    temp_min_attributes
-) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    temp_min_attributes,
+    row_hash
+)
+SELECT
+    staged.station_id,
+    staged.date,
+    staged.precipitation,
+    staged.precipitation_attributes,
+    staged.snowfall,
+    staged.snowfall_attributes,
+    staged.snow_depth,
+    staged.snow_depth_attributes,
+    staged.temp_max,
+    staged.temp_max_attributes,
+    staged.temp_min,
+    staged.temp_min_attributes,
+    staged.row_hash
+FROM weather_data_staging AS staged
+LEFT JOIN weather_data AS stored
+    ON stored.station_id = staged.station_id AND stored.date = staged.date
+-- Rows whose values are unchanged are not written at all
+WHERE stored.row_hash IS DISTINCT FROM staged.row_hash
+ON CONFLICT (station_id, date) DO UPDATE SET
+    precipitation = excluded.precipitation,
+    precipitation_attributes = excluded.precipitation_attributes,
+    snowfall = excluded.snowfall,
+    snowfall_attributes = excluded.snowfall_attributes,
+    snow_depth = excluded.snow_depth,
+    snow_depth_attributes = excluded.snow_depth_attributes,
+    temp_max = excluded.temp_max,
+    temp_max_attributes = excluded.temp_max_attributes,
+    temp_min = excluded.temp_min,
+    temp_min_attributes = excluded.temp_min_attributes,
+    row_hash = excluded.row_hash
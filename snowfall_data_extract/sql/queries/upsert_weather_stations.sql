@@ -0,0 +1,20 @@
+INSERT INTO weather_station (
+    station_id,
+    station_name,
+    latitude,
+    longitude,
+    elevation
+)
+SELECT
+    station_id,
+    station_name,
+    latitude,
+    longitude,
+    elevation
+FROM weather_station_staging
+WHERE change <> 'unchanged'
+ON CONFLICT (station_id) DO UPDATE SET
+    station_name = excluded.station_name,
+    latitude = excluded.latitude,
+    longitude = excluded.longitude,
+    elevation = excluded.elevation
@@ -0,0 +1,13 @@
+CREATE TABLE IF NOT EXISTS fetch_job (
+    station_ids VARCHAR NOT NULL,
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL,
+    position INTEGER,
+    status VARCHAR NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    response_bytes BIGINT NOT NULL DEFAULT 0,
+    duration DOUBLE NOT NULL DEFAULT 0,
+    error VARCHAR,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (station_ids, start_date, end_date)
+);
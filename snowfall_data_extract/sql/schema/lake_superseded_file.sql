@@ -0,0 +1,5 @@
+-- Lake files merged by a compaction, kept until readers scanning them are done
+CREATE TABLE IF NOT EXISTS lake_superseded_file (
+    file_name VARCHAR PRIMARY KEY,
+    superseded_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
@@ -0,0 +1,7 @@
+-- Date ranges a finished fetch job returned no data for, so they aren't refetched
+CREATE TABLE IF NOT EXISTS station_empty_range (
+    station_id VARCHAR NOT NULL,
+    start_date DATE NOT NULL,
+    end_date DATE NOT NULL,
+    PRIMARY KEY (station_id, start_date)
+);
@@ -11,5 +11,9 @@ CREATE TABLE IF NOT EXISTS weather_data (
     temp_max_attributes VARCHAR,
     temp_min INTEGER,
     temp_min_attributes VARCHAR,
+    row_hash UBIGINT,
     PRIMARY KEY (station_id, date)
 );
+
+-- Databases created before row hashes were stored; their rows are rewritten once
+ALTER TABLE weather_data ADD COLUMN IF NOT EXISTS row_hash UBIGINT;
@@ -0,0 +1,5 @@
+-- Newest version of each row across the lake's immutable Parquet files
+CREATE OR REPLACE TEMP VIEW weather_data AS
+SELECT * EXCLUDE (loaded_seq)
+FROM read_parquet('{files}')
+QUALIFY ROW_NUMBER() OVER (PARTITION BY station_id, date ORDER BY loaded_seq DESC) = 1
@@ -0,0 +1,117 @@
+import codecs
+import json
+from typing import Any, AsyncIterator, List
+
+_WHITESPACE = " \t\n\r"
+
+
+class _JSONArrayParser:
+    """Incremental parser for the elements of a top-level JSON array"""
+
+    def __init__(self) -> None:
+        self.decoder = json.JSONDecoder()
+        self.text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.started = False
+        self.finished = False
+        self.expect_separator = False
+
+    def _skip_whitespace(self, pos: int) -> int:
+        while pos < len(self.buffer) and self.buffer[pos] in _WHITESPACE:
+            pos += 1
+        return pos
+
+    def _next_token(self, pos: int) -> tuple[int, bool]:
+        """Consume the array opening, closing or a separator; returns (pos, consumed)"""
+        char = self.buffer[pos]
+        if not self.started:
+            if char != "[":
+                raise ValueError("Expected a JSON array")
+            self.started = True
+            return pos + 1, True
+        if char == "]":
+            self.finished = True
+            return pos + 1, True
+        if self.expect_separator:
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON array, got {char!r}")
+            self.expect_separator = False
+            return pos + 1, True
+        return pos, False
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        Add a chunk of the body and return the elements it completed
+
+        Args:
+            chunk: Raw UTF-8 bytes
+
+        Returns:
+            Complete array elements, in order
+        """
+        self.buffer += self.text_decoder.decode(chunk)
+        elements: List[Any] = []
+        pos = 0
+
+        while not self.finished:
+            pos = self._skip_whitespace(pos)
+            if pos >= len(self.buffer):
+                break
+
+            pos, consumed = self._next_token(pos)
+            if consumed:
+                continue
+
+            try:
+                element, end = self.decoder.raw_decode(self.buffer, pos)
+            except json.JSONDecodeError:
+                break  # element is incomplete, wait for more data
+
+            # A bare number at the end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and not isinstance(element, (dict, list, str)):
+                break
+
+            elements.append(element)
+            self.expect_separator = True
+            pos = end
+
+        self.buffer = self.buffer[pos:]
+        return elements
+
+    def close(self) -> None:
+        """
+        Check the body ended with a complete array
+
+        Raises:
+            ValueError: If the body was truncated or has trailing data
+        """
+        self.buffer += self.text_decoder.decode(b"", final=True)
+        if not self.started and not self.buffer.strip():
+            return  # empty body
+        if not self.finished:
+            raise ValueError("Incomplete JSON array in response body")
+        if self.buffer.strip():
+            raise ValueError("Unexpected data after JSON array")
+
+
+async def iter_json_array(chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+    """
+    Incrementally parse the elements of a top-level JSON array
+
+    Only the elements currently being decoded are held in memory, so a large
+    response can be consumed as it arrives instead of being loaded whole.
+
+    Args:
+        chunks: Raw UTF-8 body chunks, e.g. httpx.Response.aiter_bytes()
+
+    Yields:
+        Each array element in order
+
+    Raises:
+        ValueError: If the body is not a complete JSON array
+    """
+    parser = _JSONArrayParser()
+    async for chunk in chunks:
+        for element in parser.feed(chunk):
+            yield element
+    parser.close()
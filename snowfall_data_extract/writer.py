@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import queue
+import threading
+import types
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+from .db import JobRecord, WeatherDatabase
+from .noaa import (
+    WeatherColumns,
+    WeatherData,
+    WeatherStation,
+    column_rows,
+    concat_columns,
+    weather_data_columns,
+)
+
+logger = logging.getLogger(__name__)
+
+# Stations, observations, and ledger records of the jobs they complete
+WriteItem = Tuple[
+    List[WeatherStation], Union[List[WeatherData], WeatherColumns], List[JobRecord]
+]
+
+
+class DatabaseWriter:
+    """
+    Single writer thread that owns a WeatherDatabase connection
+
+    Fetch coroutines hand off results through a bounded queue and only wait
+    when it is full, so DuckDB writes never block the event loop. The thread
+    drains whatever is queued and commits it together in one transaction.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        sql_dir: Path | None = None,
+        max_queue: int = 8,
+        max_batch_rows: int = 100_000,
+        lake_dir: Path | None = None,
+    ):
+        """
+        Initialize writer
+
+        Args:
+            db_path: Path to DuckDB database file
+            sql_dir: Path to SQL files directory
+            max_queue: Number of pending writes before producers wait
+            max_batch_rows: Rows after which the writer stops draining and commits
+            lake_dir: Parquet lake to store weather data in, see WeatherDatabase
+        """
+        self.db_path = db_path
+        self.sql_dir = sql_dir
+        self.lake_dir = lake_dir
+        self.max_batch_rows = max_batch_rows
+        self.rows_written = 0
+        self.commits = 0
+        self._queue: queue.Queue[WriteItem | None] = queue.Queue(maxsize=max_queue)
+        self._error: BaseException | None = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="weather-db-writer", daemon=True
+        )
+
+    def start(self) -> None:
+        """Start the writer thread and wait for its connection to open"""
+        self._thread.start()
+        self._ready.wait()
+        self._raise_if_failed()
+
+    async def write(
+        self, station_info: Optional[WeatherStation], weather_data: List[WeatherData]
+    ) -> None:
+        """
+        Queue a station's metadata and observations for writing
+
+        Waits while the queue is full, which slows producers down to the rate
+        the database can absorb.
+
+        Args:
+            station_info: Station metadata, if any
+            weather_data: Weather data records, may be empty
+        """
+        stations = [station_info] if station_info is not None else []
+        await self._put((stations, weather_data, []))
+
+    async def write_columns(
+        self,
+        stations: List[WeatherStation],
+        columns: WeatherColumns,
+        jobs: List[JobRecord] | None = None,
+    ) -> None:
+        """
+        Queue station metadata and a columnar batch of observations for writing
+
+        Columnar batches go straight into the bulk load without rebuilding
+        records, which is how parse worker processes hand off their results.
+
+        Args:
+            stations: Station metadata, may be empty
+            columns: Weather data columns as built by weather_data_columns
+            jobs: Ledger records committed in the same transaction as the data
+        """
+        await self._put((stations, columns, jobs or []))
+
+    async def record_jobs(self, jobs: List[JobRecord]) -> None:
+        """
+        Queue job outcomes for the ledger, such as failures, without any data
+
+        Args:
+            jobs: Ledger records to write
+        """
+        await self._put(([], [], jobs))
+
+    async def _put(self, item: WriteItem) -> None:
+        self._raise_if_failed()
+        if not item[0] and not _rows(item) and not item[2]:
+            return
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            await asyncio.to_thread(self._queue.put, item)
+
+    async def flush(self) -> None:
+        """Wait until everything queued so far is committed, re-raising any write error"""
+        await asyncio.to_thread(self._queue.join)
+        self._raise_if_failed()
+
+    async def close(self) -> None:
+        """Flush pending writes, stop the thread and re-raise any write error"""
+        if self._thread.is_alive():
+            # None is the stop marker
+            await asyncio.to_thread(self._queue.put, None)
+            await asyncio.to_thread(self._thread.join)
+        self._raise_if_failed()
+
+    @property
+    def failed(self) -> bool:
+        """Whether a write failed, after which every further write is rejected"""
+        return self._error is not None
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("Database writer failed") from self._error
+
+    def _drain(self, first: WriteItem) -> Tuple[List[WriteItem], bool]:
+        """Collect queued items after the first one, up to max_batch_rows"""
+        items = [first]
+        rows = _rows(first)
+        while rows < self.max_batch_rows:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return items, True
+            items.append(item)
+            rows += _rows(item)
+        return items, False
+
+    def _commit(self, db: WeatherDatabase, items: List[WriteItem]) -> None:
+        columns = concat_columns(
+            [
+                data if isinstance(data, dict) else weather_data_columns(data)
+                for _, data, _ in items
+            ]
+        )
+        with db.transaction():
+            station_counts = db.upsert_stations(
+                [station for stations, _, _ in items for station in stations]
+            )
+            changed = db.upsert_weather_columns(columns)
+            db.record_jobs([job for _, _, jobs in items for job in jobs])
+        rows = column_rows(columns)
+        self.rows_written += rows
+        self.commits += 1
+        logger.debug(
+            f"Committed {rows} records ({changed} new or changed) from {len(items)} writes, "
+            f"stations: {station_counts.inserted} new, {station_counts.updated} changed, "
+            f"{station_counts.unchanged} unchanged"
+        )
+
+    def _run(self) -> None:
+        try:
+            db = WeatherDatabase(self.db_path, self.sql_dir, self.lake_dir)
+        except BaseException as e:
+            self._error = e
+            self._ready.set()
+            return
+        self._ready.set()
+
+        with db:
+            stopping = False
+            while not stopping:
+                first = self._queue.get()
+                if first is None:
+                    break
+                items, stopping = self._drain(first)
+                # keep draining after a failure so producers never block forever
+                if self._error is None:
+                    try:
+                        self._commit(db, items)
+                    except BaseException as e:
+                        logger.error(f"Database write failed: {str(e)}", exc_info=True)
+                        self._error = e
+                for _ in items:
+                    self._queue.task_done()
+
+    async def __aenter__(self) -> "DatabaseWriter":
+        self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: types.TracebackType | None,
+    ) -> None:
+        await self.close()
+
+
+def _rows(item: WriteItem) -> int:
+    data = item[1]
+    return column_rows(data) if isinstance(data, dict) else len(data)
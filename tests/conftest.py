@@ -0,0 +1,23 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from snowfall_analytics.noaa import WeatherData, WeatherStation
+
+
+def make_station(station_id: str) -> WeatherStation:
+    return WeatherStation(
+        STATION=station_id,
+        NAME=f"STATION {station_id}",
+        LATITUDE=Decimal("44.883"),
+        LONGITUDE=Decimal("-93.229"),
+        ELEVATION=Decimal("265.800"),
+    )
+
+
+def make_data(
+    station_id: str, days: int, start: date = date(2024, 1, 1), snow: str = "0.5"
+) -> list[WeatherData]:
+    return [
+        WeatherData(STATION=station_id, DATE=start + timedelta(days=i), SNOW=Decimal(snow))
+        for i in range(days)
+    ]
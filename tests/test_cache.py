@@ -0,0 +1,149 @@
+import json
+import os
+from datetime import date, timedelta
+from pathlib import Path
+
+import httpx
+import pytest
+import respx
+
+from snowfall_analytics.cache import ResponseCache, cache_key
+from snowfall_analytics.noaa import NOAAClient
+
+NOAA_URL = "https://www.ncei.noaa.gov/access/services/data/v1"
+
+
+def make_params(end_date: date, stations: str = "A,B") -> dict[str, str]:
+    return {
+        "dataset": "daily-summaries",
+        "stations": stations,
+        "startDate": (end_date - timedelta(days=30)).isoformat(),
+        "endDate": end_date.isoformat(),
+        "format": "json",
+    }
+
+
+def test_cache_key_normalizes_params() -> None:
+    """Test equivalent requests share a key and different requests don't"""
+    params = make_params(date(2020, 1, 31))
+    reordered = dict(reversed(list({**params, "stations": "B,A"}.items())))
+
+    assert cache_key(params) == cache_key(reordered)
+    assert cache_key(params) != cache_key({**params, "format": "csv"})
+
+
+def test_cache_ttl_and_compression(tmp_path: Path) -> None:
+    """Test closed windows never expire, recent ones do, and bodies are compressed"""
+    cache = ResponseCache(tmp_path, recent_ttl=0, settle_days=30)
+    closed = make_params(date(2020, 1, 31))
+    recent = make_params(date.today())
+    body = json.dumps([{"STATION": "A", "DATE": "2020-01-01"}] * 200).encode()
+
+    cache.put(closed, body)
+    cache.put(recent, body)
+
+    assert cache.get(closed) == body
+    assert cache.get(recent) is None
+    assert cache.read(recent) == body
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    entry = cache.lookup(closed)
+    assert entry is not None
+    assert entry.expires_at is None
+    assert entry.size < len(body)
+
+
+def test_cache_evicts_least_recently_used(tmp_path: Path) -> None:
+    """Test the cache stays under max_bytes by dropping the oldest-used entries"""
+    cache = ResponseCache(tmp_path, max_bytes=10_000)
+    params = [make_params(date(2020, 1, 31), stations=f"S{i}") for i in range(3)]
+    bodies = [os.urandom(4_000) for _ in params]
+
+    cache.put(params[0], bodies[0])
+    cache.put(params[1], bodies[1])
+    body_path, _ = cache.paths(cache_key(params[1]))
+    os.utime(body_path, (0, 0))  # used long ago
+    cache.put(params[2], bodies[2])
+
+    assert cache.get(params[0]) == bodies[0]
+    assert cache.get(params[1]) is None
+    assert cache.get(params[2]) == bodies[2]
+
+
+@pytest.mark.asyncio
+async def test_client_reuses_cached_responses(tmp_path: Path) -> None:
+    """Test cached windows are served without a request, including when streaming"""
+    response = [
+        {
+            "STATION": "USW00014838",
+            "NAME": "MINNEAPOLIS-ST PAUL INTERNATIONAL AIRPORT, MN US",
+            "LATITUDE": "44.8831",
+            "LONGITUDE": "-93.2289",
+            "ELEVATION": "265.8",
+            "DATE": f"2020-01-{day:02d}",
+            "SNOW": "0.5",
+        }
+        for day in range(1, 32)
+    ]
+    cache = ResponseCache(tmp_path)
+    start, end = date(2020, 1, 1), date(2020, 1, 31)
+
+    with respx.mock() as respx_mock:
+        route = respx_mock.get(NOAA_URL).mock(return_value=httpx.Response(200, json=response))
+
+        async with NOAAClient(calls_per_minute=6000, cache=cache) as client:
+            streamed = [
+                batch
+                async for batch in client.stream_station_data(
+                    "USW00014838", start, end, batch_size=10
+                )
+            ]
+            first = await client.get_station_data("USW00014838", start, end)
+            second = await client.get_station_data("USW00014838", start, end + timedelta(1))
+            third = await client.get_station_data("USW00014838", start, end + timedelta(1))
+
+    assert [record for batch, _ in streamed for record in batch] == first[0]
+    assert len(first[0]) == 31
+    assert second == third
+    # The streamed download was cached on the way through
+    assert route.call_count == 2
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+@pytest.mark.asyncio
+async def test_client_revalidates_stale_responses(tmp_path: Path) -> None:
+    """Test stale entries are revalidated with their validators and 304 reuses the body"""
+    cache = ResponseCache(tmp_path, recent_ttl=0)
+    body = [
+        {
+            "STATION": "A",
+            "NAME": "A",
+            "LATITUDE": "1",
+            "LONGITUDE": "2",
+            "ELEVATION": "3",
+            "DATE": "2024-01-01",
+            "SNOW": "1.5",
+        }
+    ]
+    headers = {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304, headers=headers)
+        return httpx.Response(200, json=body, headers=headers)
+
+    today = date.today()
+    with respx.mock() as respx_mock:
+        route = respx_mock.get(NOAA_URL).mock(side_effect=respond)
+
+        async with NOAAClient(calls_per_minute=6000, cache=cache) as client:
+            first = await client.get_station_data("A", today, today)
+            second = await client.get_station_data("A", today, today)
+            streamed = [batch async for batch in client.stream_station_data("A", today, today)]
+
+    assert route.call_count == 3
+    assert "If-None-Match" not in route.calls[0].request.headers
+    assert route.calls[1].request.headers["If-Modified-Since"] == headers["Last-Modified"]
+    assert first == second
+    assert streamed == [first]
+    assert cache.revalidated == 2
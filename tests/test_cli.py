@@ -0,0 +1,59 @@
+from datetime import date
+from pathlib import Path
+
+import httpx
+import pytest
+import respx
+
+from snowfall_analytics.cli import fetch_station_jobs
+from snowfall_analytics.db import WeatherDatabase
+from snowfall_analytics.noaa import NOAAClient
+from snowfall_analytics.writer import DatabaseWriter
+
+
+def respond(request: httpx.Request) -> httpx.Response:
+    """Return one row for the requested window, or 500 for February"""
+    if request.url.params["startDate"] == "2024-02-01":
+        return httpx.Response(500)
+    return httpx.Response(
+        200,
+        json=[
+            {
+                "STATION": "A",
+                "NAME": "STATION A",
+                "LATITUDE": "44.8831",
+                "LONGITUDE": "-93.2289",
+                "ELEVATION": "265.8",
+                "DATE": request.url.params["startDate"],
+                "SNOW": "0.5",
+            }
+        ],
+    )
+
+
+@pytest.mark.asyncio
+async def test_fetch_station_jobs_records_ledger(tmp_path: Path) -> None:
+    """Test a station's jobs are marked done or failed so a resume only retries failures"""
+    db_path = tmp_path / "cli.duckdb"
+    jobs = [
+        (["A"], date(2024, 1, 1), date(2024, 1, 31)),
+        (["A"], date(2024, 2, 1), date(2024, 2, 29)),
+        (["A"], date(2024, 3, 1), date(2024, 3, 31)),
+    ]
+    with WeatherDatabase(db_path) as db:
+        db.plan_jobs(jobs)
+
+    with respx.mock() as respx_mock:
+        respx_mock.get("https://www.ncei.noaa.gov/access/services/data/v1").mock(
+            side_effect=respond
+        )
+        async with (
+            NOAAClient(calls_per_minute=6000, max_retries=0) as client,
+            DatabaseWriter(db_path) as writer,
+        ):
+            with pytest.raises(httpx.HTTPStatusError):
+                await fetch_station_jobs("A", jobs, client, writer)
+
+    with WeatherDatabase(db_path) as db:
+        assert db.get_unfinished_jobs() == [jobs[1]]
+        assert db.get_last_dates(["A"]) == {"A": date(2024, 3, 1)}
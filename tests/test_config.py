@@ -0,0 +1,49 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from snowfall_analytics.config import ConfigWatcher, load_config
+
+
+def write_config(path: Path, stations: list[str]) -> None:
+    path.write_text(
+        json.dumps(
+            {"stations": stations, "start_date": "2024-01-01", "end_date": "2024-03-31"}
+        )
+    )
+
+
+def test_load_config_snapshot(tmp_path: Path) -> None:
+    """Test an explicit config path is used and the result is immutable and hashable"""
+    data_dir = tmp_path / "data"
+    config_path = tmp_path / "elsewhere.json"
+    write_config(config_path, ["A", "B"])
+
+    config = load_config(data_dir=data_dir, config_path=config_path)
+
+    assert config.stations.stations == ("A", "B")
+    assert config.db_path == data_dir / "snowfall.duckdb"
+    assert hash(config) == hash(load_config(data_dir=data_dir, config_path=config_path))
+    with pytest.raises(ValidationError):
+        config.stations.stations = ("C",)
+
+
+def test_config_watcher_reloads_on_change(tmp_path: Path) -> None:
+    """Test the watcher reloads after the file changes and survives a bad edit"""
+    config_path = tmp_path / "config.json"
+    write_config(config_path, ["A"])
+    watcher = ConfigWatcher(tmp_path)
+    first = watcher.current()
+
+    assert watcher.current() is first
+
+    write_config(config_path, ["A", "B"])
+    os.utime(config_path, ns=(0, 1))
+    assert watcher.current().stations.stations == ("A", "B")
+
+    config_path.write_text("{not json")
+    os.utime(config_path, ns=(0, 2))
+    assert watcher.current().stations.stations == ("A", "B")
@@ -0,0 +1,66 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import httpx
+import pytest
+
+from snowfall_analytics.config import Config, ConfigWatcher
+from snowfall_analytics.daemon import IngestDaemon, RefreshSchedule
+
+
+def test_refresh_schedule_intervals() -> None:
+    """Test refreshes are more frequent in snow season and retried sooner after failures"""
+    schedule = RefreshSchedule()
+
+    assert schedule.interval(datetime(2024, 1, 15)) == timedelta(hours=1)
+    assert schedule.interval(datetime(2024, 7, 15)) == timedelta(hours=24)
+    assert schedule.interval(datetime(2024, 7, 15), failed=True) == timedelta(minutes=15)
+
+
+@pytest.mark.asyncio
+async def test_daemon_refreshes_and_reports_health(tmp_path: Path) -> None:
+    """Test due stations are refreshed, failures retried, and status served on /health"""
+    (tmp_path / "config.json").write_text(
+        json.dumps(
+            {"stations": ["A", "B"], "start_date": "2024-01-01", "end_date": "2024-03-31"}
+        )
+    )
+    calls: list[str] = []
+
+    async def refresh(station_id: str, config: Config) -> None:
+        calls.append(station_id)
+        if calls.count("B") == 1 and station_id == "B":
+            raise RuntimeError("NOAA unavailable")
+
+    exports: list[int] = []
+
+    async def after_cycle() -> None:
+        exports.append(len(calls))
+
+    schedule = RefreshSchedule(retry_interval=timedelta(0))
+    daemon = IngestDaemon(ConfigWatcher(tmp_path), refresh, schedule, after_cycle=after_cycle)
+    task = asyncio.create_task(daemon.serve(port=0))
+
+    while daemon.status.cycles < 2:
+        await asyncio.sleep(0.01)
+    assert daemon.health_address is not None
+    host, port = daemon.health_address
+
+    async with httpx.AsyncClient() as client:
+        health = await client.get(f"http://{host}:{port}/health")
+        missing = await client.get(f"http://{host}:{port}/nope")
+
+    daemon.stop()
+    await asyncio.wait_for(task, timeout=5)
+
+    assert sorted(calls) == ["A", "B", "B"]
+    assert exports == [2, 3]
+    assert health.status_code == 200
+    status = health.json()
+    assert status["status"] == "ok"
+    assert status["stations"]["B"]["failures"] == 1
+    assert status["stations"]["B"]["runs"] == 2
+    assert status["stations"]["A"]["runs"] == 1
+    assert missing.status_code == 404
@@ -7,7 +7,7 @@ from typing import Generator
 import duckdb
 import pytest
 
-from snowfall_analytics.db import WeatherDatabase
+from snowfall_analytics.db import JobRecord, StationUpsertCounts, WeatherDatabase
 from snowfall_analytics.noaa import WeatherData, WeatherStation
 
 
@@ -50,6 +50,31 @@ def sql_dir(tmp_path: Path) -> Path:
     );
     """)
 
+    (schema_dir / "fetch_job.sql").write_text("""
+    CREATE TABLE IF NOT EXISTS fetch_job (
+        station_ids VARCHAR NOT NULL,
+        start_date DATE NOT NULL,
+        end_date DATE NOT NULL,
+        position INTEGER,
+        status VARCHAR NOT NULL DEFAULT 'pending',
+        attempts INTEGER NOT NULL DEFAULT 0,
+        response_bytes BIGINT NOT NULL DEFAULT 0,
+        duration DOUBLE NOT NULL DEFAULT 0,
+        error VARCHAR,
+        updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (station_ids, start_date, end_date)
+    );
+    """)
+
+    (schema_dir / "station_empty_range.sql").write_text("""
+    CREATE TABLE IF NOT EXISTS station_empty_range (
+        station_id VARCHAR NOT NULL,
+        start_date DATE NOT NULL,
+        end_date DATE NOT NULL,
+        PRIMARY KEY (station_id, start_date)
+    );
+    """)
+
     # Create queries directory and files
     queries_dir = sql_dir / "queries"
     queries_dir.mkdir()
@@ -64,6 +89,25 @@ def sql_dir(tmp_path: Path) -> Path:
     ) VALUES (?, ?, ?, ?, ?);
     """)
 
+    (queries_dir / "stage_weather_data.sql").write_text("""
+    CREATE OR REPLACE TEMP TABLE weather_data_staging AS
+    SELECT
+        station_id,
+        date,
+        CAST(precipitation AS DECIMAL) AS precipitation,
+        precipitation_attributes,
+        CAST(snowfall AS DECIMAL) AS snowfall,
+        snowfall_attributes,
+        CAST(snow_depth AS DECIMAL) AS snow_depth,
+        snow_depth_attributes,
+        CAST(temp_max AS INTEGER) AS temp_max,
+        temp_max_attributes,
+        CAST(temp_min AS INTEGER) AS temp_min,
+        temp_min_attributes
+    FROM weather_data_batch
+    QUALIFY ROW_NUMBER() OVER (PARTITION BY station_id, date ORDER BY batch_row DESC) = 1;
+    """)
+
     (queries_dir / "upsert_weather_data.sql").write_text("""
     INSERT OR REPLACE INTO weather_data (
         station_id,
@@ -78,7 +122,8 @@ def sql_dir(tmp_path: Path) -> Path:
         temp_max_attributes,
         temp_min,
         temp_min_attributes
-    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);
+    )
+    SELECT * FROM weather_data_staging;
     """)
 
     return sql_dir
@@ -149,6 +194,14 @@ def db(sql_dir: Path) -> Generator[WeatherDatabase, None, None]:
     tmp_path.unlink(missing_ok=True)
 
 
+@pytest.fixture
+def packaged_db(tmp_path: Path) -> Generator[WeatherDatabase, None, None]:
+    """Create temporary database using the SQL files shipped with the package"""
+    db = WeatherDatabase(tmp_path / "packaged.duckdb")
+    yield db
+    db.close()
+
+
 def test_init_schema(db: WeatherDatabase) -> None:
     """Test database schema initialization"""
     # Check that tables were created
@@ -259,3 +312,213 @@ def test_database_context_manager(sql_dir: Path) -> None:
     finally:
         # Clean up the database file
         db_path.unlink(missing_ok=True)
+
+
+def test_get_missing_ranges(
+    packaged_db: WeatherDatabase, sample_weather_data: list[WeatherData]
+) -> None:
+    """Test incremental range detection from stored dates"""
+    station_id = sample_weather_data[0].station_id
+
+    # Nothing stored yet - the whole range is missing
+    assert packaged_db.get_missing_ranges(station_id, date(2023, 1, 1), date(2024, 1, 31)) == [
+        (date(2023, 1, 1), date(2024, 1, 31))
+    ]
+
+    gap_record = sample_weather_data[1].model_copy(update={"date": date(2024, 1, 10)})
+    packaged_db.upsert_weather_data([*sample_weather_data, gap_record])
+
+    # Leading range plus everything after the high-water mark
+    ranges = packaged_db.get_missing_ranges(
+        station_id, date(2023, 12, 1), date(2024, 1, 31), refresh_days=0
+    )
+    assert ranges == [
+        (date(2023, 12, 1), date(2023, 12, 31)),
+        (date(2024, 1, 11), date(2024, 1, 31)),
+    ]
+
+    # Refresh window reaches back past the high-water mark, gaps are filled
+    ranges = packaged_db.get_missing_ranges(
+        station_id, date(2024, 1, 1), date(2024, 1, 12), refresh_days=2, fill_gaps=True
+    )
+    assert ranges == [
+        (date(2024, 1, 3), date(2024, 1, 9)),
+        (date(2024, 1, 11), date(2024, 1, 12)),
+    ]
+
+    # A finished job showed the station has no data before its record starts
+    packaged_db.record_jobs(
+        [
+            JobRecord(
+                station_ids=[station_id, "EMPTY"],
+                start_date=date(2023, 6, 1),
+                end_date=date(2024, 1, 31),
+                first_dates={station_id: date(2024, 1, 1)},
+            )
+        ]
+    )
+    ranges = packaged_db.get_missing_ranges(
+        station_id, date(2023, 1, 1), date(2024, 1, 31), refresh_days=0
+    )
+    assert ranges == [
+        (date(2023, 1, 1), date(2023, 5, 31)),
+        (date(2024, 1, 11), date(2024, 1, 31)),
+    ]
+    # A station without any data only refetches what wasn't covered, plus the refresh window
+    ranges = packaged_db.get_missing_ranges(
+        "EMPTY", date(2023, 1, 1), date(2024, 1, 31), refresh_days=7
+    )
+    assert ranges == [
+        (date(2023, 1, 1), date(2023, 5, 31)),
+        (date(2024, 1, 25), date(2024, 1, 31)),
+    ]
+
+
+def test_get_last_dates(
+    packaged_db: WeatherDatabase, sample_weather_data: list[WeatherData]
+) -> None:
+    """Test last stored date lookup per station"""
+    packaged_db.upsert_weather_data(sample_weather_data)
+
+    last_dates = packaged_db.get_last_dates(["USW00014838", "NONEXISTENT"])
+
+    assert last_dates == {"USW00014838": date(2024, 1, 2), "NONEXISTENT": None}
+
+
+def test_upsert_weather_data_replaces_and_dedupes(
+    packaged_db: WeatherDatabase, sample_weather_data: list[WeatherData]
+) -> None:
+    """Test bulk upserts replace existing rows and keep the last duplicate in a batch"""
+    packaged_db.upsert_weather_data(sample_weather_data)
+
+    revised = sample_weather_data[0].model_copy(
+        update={"snowfall": Decimal("1.25"), "temp_max": None, "snowfall_attributes": "T,,"}
+    )
+    superseded = revised.model_copy(update={"snowfall": Decimal("9.9")})
+    packaged_db.upsert_weather_data([superseded, revised])
+
+    rows = packaged_db.conn.execute(
+        "SELECT date, snowfall, snowfall_attributes, temp_max FROM weather_data ORDER BY date"
+    ).fetchall()
+
+    assert rows == [
+        (date(2024, 1, 1), Decimal("1.250"), "T,,", None),
+        (date(2024, 1, 2), Decimal("0.000"), ",,", 32),
+    ]
+
+
+def test_job_ledger(packaged_db: WeatherDatabase) -> None:
+    """Test planned jobs stay unfinished until recorded as done"""
+    jobs = [
+        (["B"], date(2024, 1, 1), date(2024, 1, 31)),
+        (["A", "C"], date(2024, 1, 1), date(2024, 1, 31)),
+        (["A", "C"], date(2024, 2, 1), date(2024, 2, 29)),
+    ]
+    assert not packaged_db.has_job_plan()
+    packaged_db.plan_jobs(jobs)
+    assert packaged_db.has_job_plan()
+
+    packaged_db.record_jobs(
+        [
+            JobRecord(
+                station_ids=["B"], start_date=date(2024, 1, 1), end_date=date(2024, 1, 31)
+            ),
+            JobRecord(
+                station_ids=["A", "C"],
+                start_date=date(2024, 2, 1),
+                end_date=date(2024, 2, 29),
+                status="failed",
+                error="boom",
+            ),
+        ]
+    )
+    packaged_db.record_jobs(
+        [
+            JobRecord(
+                station_ids=["A", "C"],
+                start_date=date(2024, 2, 1),
+                end_date=date(2024, 2, 29),
+                status="failed",
+            )
+        ]
+    )
+
+    assert packaged_db.get_unfinished_jobs() == jobs[1:]
+    attempts = packaged_db.conn.execute(
+        "SELECT station_ids, status, attempts FROM fetch_job ORDER BY position"
+    ).fetchall()
+    assert attempts == [("B", "done", 1), ("A,C", "pending", 0), ("A,C", "failed", 2)]
+
+    packaged_db.plan_jobs(jobs[:1])
+    assert packaged_db.get_unfinished_jobs() == jobs[:1]
+
+    packaged_db.plan_jobs([])
+    assert not packaged_db.has_job_plan()
+
+
+def test_transaction(
+    packaged_db: WeatherDatabase,
+    sample_station: WeatherStation,
+    sample_weather_data: list[WeatherData],
+) -> None:
+    """Test transactions commit together, roll back together, and commit every n rows"""
+    other = packaged_db.conn.cursor()
+
+    def count(table: str) -> int:
+        result = other.execute(f"SELECT COUNT(*) FROM {table}").fetchone()
+        assert result is not None
+        return int(result[0])
+
+    with pytest.raises(RuntimeError):
+        with packaged_db.transaction():
+            packaged_db.upsert_station(sample_station)
+            packaged_db.upsert_weather_data(sample_weather_data)
+            raise RuntimeError("boom")
+    assert (count("weather_station"), count("weather_data")) == (0, 0)
+
+    # A failed statement aborts the outer transaction; its own error must surface
+    undated = sample_weather_data[0].model_copy(update={"date": None})
+    with pytest.raises(duckdb.ConstraintException):
+        with packaged_db.transaction():
+            packaged_db.upsert_weather_data([undated])
+
+    with packaged_db.transaction(commit_every_n_rows=2):
+        packaged_db.upsert_station(sample_station)
+        packaged_db.upsert_weather_data(sample_weather_data[:1])
+        assert (count("weather_station"), count("weather_data")) == (0, 0)
+        packaged_db.upsert_weather_data(sample_weather_data[1:])
+        assert (count("weather_station"), count("weather_data")) == (1, 2)
+
+
+def test_upsert_stations(packaged_db: WeatherDatabase, sample_station: WeatherStation) -> None:
+    """Test bulk station upserts only write new or changed stations and count them"""
+    other = sample_station.model_copy(update={"station_id": "USC00214884", "name": "OTHER"})
+
+    counts = packaged_db.upsert_stations([sample_station, other, sample_station])
+    assert (counts.inserted, counts.updated, counts.unchanged) == (2, 0, 0)
+
+    moved = other.model_copy(update={"elevation": Decimal("270.5")})
+    counts = packaged_db.upsert_stations([sample_station, moved])
+    assert (counts.inserted, counts.updated, counts.unchanged) == (0, 1, 1)
+
+    rows = packaged_db.conn.execute(
+        "SELECT station_id, elevation FROM weather_station ORDER BY station_id"
+    ).fetchall()
+    assert rows == [("USC00214884", Decimal("270.500")), ("USW00014838", Decimal("265.800"))]
+    assert packaged_db.upsert_stations([]) == StationUpsertCounts()
+
+
+def test_upsert_weather_data_skips_unchanged_rows(
+    packaged_db: WeatherDatabase, sample_weather_data: list[WeatherData]
+) -> None:
+    """Test refetched rows are only written when their values changed"""
+    assert packaged_db.upsert_weather_data(sample_weather_data) == 2
+    assert packaged_db.upsert_weather_data(sample_weather_data) == 0
+
+    revised = sample_weather_data[1].model_copy(update={"snowfall_attributes": "T,,"})
+    assert packaged_db.upsert_weather_data([sample_weather_data[0], revised]) == 1
+
+    # Rows stored before hashes existed are rewritten once
+    packaged_db.conn.execute("UPDATE weather_data SET row_hash = NULL")
+    assert packaged_db.upsert_weather_data([sample_weather_data[0], revised]) == 2
+    assert packaged_db.upsert_weather_data([sample_weather_data[0], revised]) == 0
@@ -0,0 +1,55 @@
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+import duckdb
+
+from snowfall_analytics.db import WeatherDatabase
+from snowfall_analytics.export import ParquetExporter
+
+from .conftest import make_data
+
+
+def read_export(export_dir: Path) -> list[tuple[str, int, int]]:
+    return duckdb.sql(
+        f"""
+        SELECT station_id, year, COUNT(*)
+        FROM read_parquet('{export_dir}/**/*.parquet', hive_partitioning = true)
+        GROUP BY ALL
+        ORDER BY ALL
+        """
+    ).fetchall()
+
+
+def test_export_rewrites_only_changed_partitions(tmp_path: Path) -> None:
+    """Test the export is partitioned by station and year and only changes what changed"""
+    export_dir = tmp_path / "parquet"
+    with WeatherDatabase(tmp_path / "export.duckdb") as db:
+        db.upsert_weather_data(make_data("A", 4, start=date(2023, 12, 30)))
+        db.upsert_weather_data(make_data("B", 3))
+        exporter = ParquetExporter(db, export_dir)
+
+        first = exporter.export()
+        assert (first.written, first.unchanged, first.removed) == (3, 0, 0)
+        assert read_export(export_dir) == [("A", 2023, 2), ("A", 2024, 2), ("B", 2024, 3)]
+        assert (export_dir / "station_id=A" / "year=2023").is_dir()
+
+        again = exporter.export()
+        assert (again.written, again.unchanged, again.removed) == (0, 3, 0)
+
+        revised = make_data("A", 1)[0]
+        db.upsert_weather_data([revised.model_copy(update={"snowfall": Decimal("2.0")})])
+        db.conn.execute("DELETE FROM weather_data WHERE station_id = 'B'")
+
+        update = exporter.export()
+        assert (update.written, update.unchanged, update.removed) == (1, 1, 1)
+        assert read_export(export_dir) == [("A", 2023, 2), ("A", 2024, 2)]
+        assert not (export_dir / "station_id=B").exists()
+        snowfall = duckdb.sql(
+            f"""
+            SELECT snowfall
+            FROM read_parquet('{export_dir}/**/*.parquet', hive_partitioning = true)
+            WHERE date = '2024-01-01'
+            """
+        ).fetchone()
+        assert snowfall == (Decimal("2.000"),)
@@ -0,0 +1,94 @@
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from snowfall_analytics.db import WeatherDatabase
+from snowfall_analytics.noaa import WeatherData, WeatherStation
+
+from .conftest import make_data
+
+
+def snowfall_by_date(db: WeatherDatabase) -> list[tuple[date, Decimal]]:
+    rows: list[tuple[date, Decimal]] = db.conn.execute(
+        "SELECT date, snowfall FROM weather_data ORDER BY date"
+    ).fetchall()
+    return rows
+
+
+def test_lake_appends_and_reads_newest_rows(tmp_path: Path) -> None:
+    """Test upserts append files of changed rows only and the view shows the newest"""
+    lake_dir = tmp_path / "lake"
+    with WeatherDatabase(tmp_path / "lake.duckdb", lake_dir=lake_dir) as db:
+        assert db.lake is not None
+        assert db.upsert_weather_data(make_data("A", 3)) == 3
+        assert db.upsert_weather_data(make_data("A", 3)) == 0
+        assert db.upsert_weather_data(make_data("A", 1, snow="2.0")) == 1
+
+        assert len(db.lake.files()) == 3  # the empty seed file and two appends
+        assert snowfall_by_date(db) == [
+            (date(2024, 1, 1), Decimal("2.000")),
+            (date(2024, 1, 2), Decimal("0.500")),
+            (date(2024, 1, 3), Decimal("0.500")),
+        ]
+        assert db.get_last_dates(["A"]) == {"A": date(2024, 1, 3)}
+
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                db.upsert_weather_data(make_data("B", 2))
+                raise RuntimeError("boom")
+        assert len(db.lake.files()) == 3
+        assert not list((lake_dir / "weather_data").glob("*.pending"))
+
+        assert db.compact_weather_data(min_files=4) == 0
+        assert db.compact_weather_data(min_files=2) == 3
+        assert len(db.lake.files()) == 1
+        before = snowfall_by_date(db)
+        # Merged files stay for readers still scanning them until the grace period ends
+        part_files = sorted((lake_dir / "weather_data").glob("part-*.parquet"))
+        assert len(part_files) == 4
+        assert snowfall_by_date(db) == before
+        assert db.compact_weather_data(min_files=2) == 0
+        assert sorted((lake_dir / "weather_data").glob("part-*.parquet")) == part_files
+        assert db.compact_weather_data(min_files=2, grace_seconds=0) == 0
+        assert list((lake_dir / "weather_data").glob("part-*.parquet")) == db.lake.files()
+
+    # A file left pending by a crash before publishing is deleted on open
+    stale = lake_dir / "weather_data" / "part-0000000000000000001-crashed.parquet.pending"
+    stale.write_bytes(b"")
+
+    # A new connection sees the same data through its own view
+    with WeatherDatabase(tmp_path / "lake.duckdb", lake_dir=lake_dir) as db:
+        assert snowfall_by_date(db) == before
+    assert not stale.exists()
+
+
+def test_lake_keeps_stations_in_tables(tmp_path: Path) -> None:
+    """Test stations stay in DuckDB and a table-mode database is not reused for a lake"""
+    station = WeatherStation(STATION="A", NAME="A", LATITUDE="1", LONGITUDE="2", ELEVATION="3")
+    with WeatherDatabase(tmp_path / "lake.duckdb", lake_dir=tmp_path / "lake") as db:
+        assert db.upsert_stations([station]).inserted == 1
+
+    with WeatherDatabase(tmp_path / "table.duckdb"):
+        pass
+    with pytest.raises(ValueError, match="already stores weather_data"):
+        WeatherDatabase(tmp_path / "table.duckdb", lake_dir=tmp_path / "lake")
+
+
+def test_lake_files_share_one_schema(tmp_path: Path) -> None:
+    """Test a batch without any attribute values is written with the stored types"""
+    with WeatherDatabase(tmp_path / "lake.duckdb", lake_dir=tmp_path / "lake") as db:
+        assert db.lake is not None
+        db.upsert_weather_data(make_data("A", 1))
+        flagged = WeatherData(STATION="A", DATE=date(2024, 1, 2), SNOW_ATTRIBUTES=",,7")
+        db.upsert_weather_data([flagged])
+
+        mixed = db.conn.execute(
+            "SELECT name FROM parquet_schema(?) GROUP BY name HAVING COUNT(DISTINCT type) > 1",
+            [[str(f) for f in db.lake.files()]],
+        ).fetchall()
+        assert mixed == []
+        assert db.conn.execute(
+            "SELECT snowfall_attributes FROM weather_data ORDER BY date"
+        ).fetchall() == [(None,), (",,7",)]
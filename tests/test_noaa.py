@@ -1,11 +1,32 @@
+import asyncio
+import json
+import time
 from datetime import date
 from decimal import Decimal
+from pathlib import Path
 
 import httpx
 import pytest
 import respx
+from pydantic import ValidationError
 
-from snowfall_analytics.noaa import NOAAClient, WeatherData, WeatherStation
+from snowfall_analytics.noaa import (
+    AdaptiveRateLimit,
+    NOAAClient,
+    RateLimit,
+    TransportSettings,
+    WeatherData,
+    WeatherStation,
+    parse_csv_response,
+    parse_json_response,
+    parse_response_columns,
+    parse_retry_after,
+    split_date_range,
+    validate_weather_columns,
+    validate_weather_data,
+    weather_data_columns,
+    weather_data_records,
+)
 
 
 @pytest.fixture
@@ -105,3 +126,439 @@ async def test_get_station_data_error() -> None:
                 await client.get_station_data(
                     "USW00014838", date(2024, 1, 1), date(2024, 1, 1)
                 )
+
+
+def test_split_date_range_water_year() -> None:
+    """Test splitting a range on water-year boundaries"""
+    windows = split_date_range(date(2020, 1, 1), date(2021, 12, 31), "water_year")
+
+    assert windows == [
+        (date(2020, 1, 1), date(2020, 9, 30)),
+        (date(2020, 10, 1), date(2021, 9, 30)),
+        (date(2021, 10, 1), date(2021, 12, 31)),
+    ]
+
+
+def test_split_date_range_month_and_days() -> None:
+    """Test splitting a range by month and by a fixed number of days"""
+    months = split_date_range(date(2024, 11, 15), date(2025, 1, 10), "month")
+    assert months == [
+        (date(2024, 11, 15), date(2024, 11, 30)),
+        (date(2024, 12, 1), date(2024, 12, 31)),
+        (date(2025, 1, 1), date(2025, 1, 10)),
+    ]
+
+    days = split_date_range(date(2024, 1, 1), date(2024, 1, 5), "2")
+    assert days == [
+        (date(2024, 1, 1), date(2024, 1, 2)),
+        (date(2024, 1, 3), date(2024, 1, 4)),
+        (date(2024, 1, 5), date(2024, 1, 5)),
+    ]
+
+    with pytest.raises(ValueError):
+        split_date_range(date(2024, 1, 1), date(2024, 1, 5), "fortnight")
+
+
+@pytest.mark.asyncio
+async def test_get_station_data_chunked(
+    mock_station_response: list[dict[str, str]],
+) -> None:
+    """Test chunked fetch stitches windows in order and retries a failed window"""
+    attempts: dict[str, int] = {}
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        start = request.url.params["startDate"]
+        attempts[start] = attempts.get(start, 0) + 1
+        if start == "2024-01-01" and attempts[start] == 1:
+            return httpx.Response(404)
+        return httpx.Response(200, json=[{**mock_station_response[0], "DATE": start}])
+
+    with respx.mock() as respx_mock:
+        respx_mock.get("https://www.ncei.noaa.gov/access/services/data/v1").mock(
+            side_effect=respond
+        )
+
+        async with NOAAClient(calls_per_minute=6000) as client:
+            weather_data, station_info = await client.get_station_data_chunked(
+                "USW00014838", date(2023, 12, 1), date(2024, 2, 15), window="month"
+            )
+
+    assert [d.date for d in weather_data] == [
+        date(2023, 12, 1),
+        date(2024, 1, 1),
+        date(2024, 2, 1),
+    ]
+    assert attempts["2024-01-01"] == 2
+    assert station_info is not None
+    assert station_info.station_id == "USW00014838"
+
+
+@pytest.mark.asyncio
+async def test_get_stations_data_batched(
+    mock_station_response: list[dict[str, str]],
+) -> None:
+    """Test multi-station requests are split back into per-station results"""
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        stations = request.url.params["stations"].split(",")
+        rows = [
+            {**mock_station_response[0], "STATION": s, "DATE": d}
+            for s in stations
+            if s != "EMPTY"
+            for d in ("2024-01-02", "2024-01-01")
+        ]
+        return httpx.Response(200, json=rows)
+
+    with respx.mock() as respx_mock:
+        route = respx_mock.get("https://www.ncei.noaa.gov/access/services/data/v1").mock(
+            side_effect=respond
+        )
+
+        async with NOAAClient(calls_per_minute=6000) as client:
+            results = await client.get_stations_data(
+                ["A", "B", "EMPTY"], date(2024, 1, 1), date(2024, 1, 2), batch_size=2
+            )
+
+    assert route.call_count == 2
+    assert sorted(c.request.url.params["stations"] for c in route.calls) == ["A,B", "EMPTY"]
+    assert set(results) == {"A", "B", "EMPTY"}
+
+    weather_data, station_info = results["B"]
+    assert [d.date for d in weather_data] == [date(2024, 1, 1), date(2024, 1, 2)]
+    assert all(d.station_id == "B" for d in weather_data)
+    assert station_info is not None
+    assert station_info.station_id == "B"
+
+    assert results["EMPTY"] == ([], None)
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_concurrent_waiters() -> None:
+    """Test concurrent callers share the bucket and are served in arrival order"""
+    limiter = RateLimit(calls_per_minute=600, burst=2)  # one token per 0.1s
+    order: list[int] = []
+    times: list[float] = []
+
+    async def call(i: int) -> None:
+        await limiter.wait()
+        order.append(i)
+        times.append(time.monotonic())
+
+    start = time.monotonic()
+    await asyncio.gather(*(call(i) for i in range(5)))
+
+    assert order == [0, 1, 2, 3, 4]
+    # Burst of two is immediate, the rest are spaced by the refill interval
+    assert times[1] - start < 0.05
+    for earlier, later in zip(times[1:], times[2:], strict=False):
+        assert later - earlier >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_retry_after_pauses_queued_waiters() -> None:
+    """Test a Retry-After set while callers are queued holds all of them, in order"""
+    limiter = AdaptiveRateLimit(calls_per_minute=600, max_calls_per_minute=600)
+    order: list[int] = []
+    times: list[float] = []
+
+    async def call(i: int) -> None:
+        await limiter.wait()
+        if i == 0:
+            limiter.record_throttle(retry_after=0.5)
+        order.append(i)
+        times.append(time.monotonic())
+
+    start = time.monotonic()
+    await asyncio.gather(*(call(i) for i in range(4)))
+
+    assert order == [0, 1, 2, 3]
+    assert all(t - start >= 0.5 for t in times[1:])
+
+
+def test_adaptive_rate_limit_aimd(tmp_path: Path) -> None:
+    """Test additive increase, multiplicative decrease and persistence"""
+    limiter = AdaptiveRateLimit(
+        calls_per_minute=10, max_calls_per_minute=12, increase=2, success_threshold=3
+    )
+
+    for _ in range(3):
+        limiter.record_success()
+    assert limiter.calls_per_minute == 12
+
+    # Capped at the maximum
+    for _ in range(3):
+        limiter.record_success()
+    assert limiter.calls_per_minute == 12
+
+    limiter.record_throttle()
+    assert limiter.calls_per_minute == 6
+    assert limiter.min_interval == 10.0
+
+    state_path = tmp_path / "rate_limit.json"
+    limiter.save(state_path)
+    assert AdaptiveRateLimit.load(state_path).calls_per_minute == 6
+    assert AdaptiveRateLimit.load(tmp_path / "missing.json").calls_per_minute == 5
+
+
+def test_parse_retry_after() -> None:
+    """Test Retry-After parsing for delay seconds and HTTP dates"""
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("not a date") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+@pytest.mark.asyncio
+async def test_retry_after_honored(mock_station_response: list[dict[str, str]]) -> None:
+    """Test a 429 with Retry-After lowers the learned rate and retries after the delay"""
+    limiter = AdaptiveRateLimit(calls_per_minute=6000, max_calls_per_minute=6000)
+
+    with respx.mock() as respx_mock:
+        respx_mock.get("https://www.ncei.noaa.gov/access/services/data/v1").mock(
+            side_effect=[
+                httpx.Response(429, headers={"Retry-After": "0.2"}),
+                httpx.Response(200, json=mock_station_response),
+            ]
+        )
+
+        start = time.monotonic()
+        async with NOAAClient(rate_limiter=limiter) as client:
+            weather_data, _ = await client.get_station_data(
+                "USW00014838", date(2024, 1, 1), date(2024, 1, 1)
+            )
+
+    assert len(weather_data) == 1
+    assert time.monotonic() - start >= 0.2
+    assert limiter.calls_per_minute == 3000
+
+
+@pytest.mark.asyncio
+async def test_stream_station_data(mock_station_response: list[dict[str, str]]) -> None:
+    """Test streamed responses are yielded in validated batches"""
+    rows = [{**mock_station_response[0], "DATE": f"2024-01-{day:02d}"} for day in range(1, 6)]
+
+    with respx.mock() as respx_mock:
+        respx_mock.get("https://www.ncei.noaa.gov/access/services/data/v1").mock(
+            return_value=httpx.Response(200, json=rows)
+        )
+
+        async with NOAAClient() as client:
+            batches = [
+                batch
+                async for batch in client.stream_station_data(
+                    "USW00014838", date(2024, 1, 1), date(2024, 1, 5), batch_size=2
+                )
+            ]
+
+    assert [len(weather_data) for weather_data, _ in batches] == [2, 2, 1]
+    assert [d.date.day for weather_data, _ in batches for d in weather_data] == [1, 2, 3, 4, 5]
+    station_info = batches[0][1]
+    assert station_info is not None
+    assert station_info.station_id == "USW00014838"
+
+    async with NOAAClient(response_format="csv") as client:
+        with pytest.raises(ValueError, match="only supports JSON"):
+            async for _ in client.stream_station_data(
+                "USW00014838", date(2024, 1, 1), date(2024, 1, 5)
+            ):
+                pass
+
+
+def test_parse_csv_response_matches_json(mock_station_response: list[dict[str, str]]) -> None:
+    """Test CSV parsing produces the same models as validating the JSON response"""
+    rows = [
+        mock_station_response[0],
+        {
+            **mock_station_response[0],
+            "DATE": "2024-01-02",
+            "SNOW": "",
+            "SNOW_ATTRIBUTES": "",
+            "TMAX": "  -3",
+        },
+    ]
+    # NOAA omits empty values from JSON rows
+    json_rows = [{k: v for k, v in row.items() if v} for row in rows]
+    header = list(rows[0])
+    csv_lines = [",".join(f'"{h}"' for h in header)]
+    csv_lines += [",".join(f'"{row[h]}"' for h in header) for row in rows]
+
+    weather_data, stations = parse_csv_response("\n".join(csv_lines).encode())
+
+    assert weather_data == [WeatherData.model_validate(row) for row in json_rows]
+    assert weather_data[1].snowfall is None
+    assert weather_data[1].temp_max == -3
+    assert stations == {"USW00014838": WeatherStation.model_validate(json_rows[0])}
+    assert parse_csv_response(b"") == ([], {})
+
+
+def test_parse_csv_response_validates_like_json(
+    mock_station_response: list[dict[str, str]],
+) -> None:
+    """Test CSV values are accepted and rejected by the same field validation as JSON"""
+
+    def to_csv(row: dict[str, str]) -> bytes:
+        return (
+            ",".join(f'"{h}"' for h in row) + "\n" + ",".join(f'"{v}"' for v in row.values())
+        ).encode()
+
+    row = {**mock_station_response[0], "TMAX": "3.0"}
+    weather_data, _ = parse_csv_response(to_csv(row))
+    assert weather_data == [WeatherData.model_validate(row)]
+    assert weather_data[0].temp_max == 3
+
+    for field, bad in (("TMAX", "3.5"), ("SNOW", "lots"), ("DATE", "2024-13-01")):
+        with pytest.raises(ValidationError):
+            WeatherData.model_validate({**row, field: bad})
+        with pytest.raises(ValidationError):
+            parse_csv_response(to_csv({**row, field: bad}))
+
+
+@pytest.mark.asyncio
+async def test_get_station_data_csv_missing_columns() -> None:
+    """Test CSV requests and data types absent from the response"""
+    body = (
+        '"STATION","DATE","LATITUDE","LONGITUDE","ELEVATION","NAME","PRCP","PRCP_ATTRIBUTES"\n'
+        '"USC00041072","2024-01-01","34.24","-116.89","2060.4","BIG BEAR LAKE, CA US",'
+        '"0.10",",,7"\n'
+    )
+
+    with respx.mock() as respx_mock:
+        route = respx_mock.get("https://www.ncei.noaa.gov/access/services/data/v1").mock(
+            return_value=httpx.Response(200, text=body)
+        )
+
+        async with NOAAClient(response_format="csv") as client:
+            weather_data, station_info = await client.get_station_data(
+                "USC00041072", date(2024, 1, 1), date(2024, 1, 1)
+            )
+
+    assert route.calls[0].request.url.params["format"] == "csv"
+    assert weather_data == [
+        WeatherData.model_validate(
+            {
+                "STATION": "USC00041072",
+                "DATE": "2024-01-01",
+                "PRCP": "0.10",
+                "PRCP_ATTRIBUTES": ",,7",
+            }
+        )
+    ]
+    assert station_info is not None
+    assert station_info.name == "BIG BEAR LAKE, CA US"
+    assert station_info.elevation == Decimal("2060.4")
+
+
+def test_validate_weather_data_matches_per_row(
+    mock_station_response: list[dict[str, str]],
+) -> None:
+    """Test batch validation matches per-row validation, including errors"""
+    rows = [mock_station_response[0], {**mock_station_response[0], "DATE": "2024-01-02"}]
+
+    assert validate_weather_data(rows) == [WeatherData.model_validate(r) for r in rows]
+
+    with pytest.raises(ValidationError):
+        validate_weather_data([*rows, {**rows[0], "TMAX": "warm"}])
+
+    weather_data, stations = parse_json_response(json.dumps(rows).encode())
+    assert weather_data == validate_weather_data(rows)
+    assert list(stations) == ["USW00014838"]
+
+
+def test_parse_response_columns(mock_station_response: list[dict[str, str]]) -> None:
+    """Test columnar parsing of JSON and CSV bodies gives the same batch"""
+    rows = [mock_station_response[0], {**mock_station_response[0], "DATE": "2024-01-02"}]
+    rows[1]["SNOW"] = ""
+    json_rows = [{k: v for k, v in row.items() if v} for row in rows]
+    header = list(rows[0])
+    csv_lines = [",".join(f'"{h}"' for h in header)]
+    csv_lines += [",".join(f'"{row[h]}"' for h in header) for row in rows]
+
+    columns, stations = parse_response_columns(json.dumps(json_rows).encode())
+    csv_columns, csv_stations = parse_response_columns("\n".join(csv_lines).encode(), "csv")
+
+    assert columns == weather_data_columns(validate_weather_data(json_rows))
+    assert columns["date"] == [date(2024, 1, 1), date(2024, 1, 2)]
+    assert columns["snowfall"] == ["0.5", None]
+    assert columns["temp_max"] == [28, 28]
+    assert csv_columns == columns
+    assert csv_stations == stations
+    assert parse_response_columns(b"", "csv") == (weather_data_columns([]), {})
+
+
+@pytest.mark.asyncio
+async def test_transport_settings(
+    mock_station_response: list[dict[str, str]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test timeouts and compression are applied and HTTP/2 falls back without h2"""
+    transport = TransportSettings(connect_timeout=5, read_timeout=30, accept_encoding="gzip")
+
+    with respx.mock() as respx_mock:
+        route = respx_mock.get("https://www.ncei.noaa.gov/access/services/data/v1").mock(
+            return_value=httpx.Response(200, json=mock_station_response)
+        )
+        async with NOAAClient(transport=transport) as client:
+            await client.get_station_data("USW00014838", date(2024, 1, 1), date(2024, 1, 1))
+            timeout = client.client.timeout
+
+    assert route.calls[0].request.headers["Accept-Encoding"] == "gzip"
+    assert (timeout.connect, timeout.read, timeout.pool) == (5, 30, None)
+
+    monkeypatch.setattr("importlib.util.find_spec", lambda name: None)
+    assert not TransportSettings().http2_enabled()
+    assert not TransportSettings(http2=False).http2_enabled()
+
+
+def test_validate_weather_columns(mock_station_response: list[dict[str, str]]) -> None:
+    """Test column-wise validation matches the models and rejects the same input"""
+    rows = [
+        mock_station_response[0],
+        {"STATION": "USW00014838", "DATE": "2024-01-02", "SNOW": "1.20"},
+    ]
+
+    assert validate_weather_columns(rows) == weather_data_columns(validate_weather_data(rows))
+    assert validate_weather_columns([]) == weather_data_columns([])
+    records = validate_weather_data(rows)
+    assert weather_data_records(validate_weather_columns(rows)) == records
+    assert weather_data_records(weather_data_columns([])) == []
+
+    for bad in ({**rows[0], "TMAX": "warm"}, {"STATION": "USW00014838"}):
+        with pytest.raises(ValidationError):
+            validate_weather_columns([rows[0], bad])
+
+
+@pytest.mark.asyncio
+async def test_get_station_and_stations_columns(
+    mock_station_response: list[dict[str, str]],
+) -> None:
+    """Test columnar fetches match the record-based fetches"""
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        stations = request.url.params["stations"].split(",")
+        start = request.url.params["startDate"]
+        return httpx.Response(
+            200,
+            json=[{**mock_station_response[0], "STATION": s, "DATE": start} for s in stations],
+        )
+
+    with respx.mock() as respx_mock:
+        respx_mock.get("https://www.ncei.noaa.gov/access/services/data/v1").mock(
+            side_effect=respond
+        )
+
+        async with NOAAClient(calls_per_minute=6000) as client:
+            start, end = date(2023, 12, 1), date(2024, 2, 15)
+            chunked = await client.get_station_data_chunked("A", start, end, window="month")
+            columns, station_info = await client.get_station_columns(
+                "A", start, end, window="month"
+            )
+            batched = await client.get_stations_data(["A", "B", "C"], start, end, batch_size=2)
+            batch_columns, stations = await client.get_stations_columns(
+                ["A", "B", "C"], start, end, batch_size=2
+            )
+
+    assert columns == weather_data_columns(chunked[0])
+    assert station_info == chunked[1]
+    assert sorted(zip(batch_columns["station_id"], batch_columns["date"], strict=True)) == [
+        (s, start) for s in ("A", "B", "C")
+    ]
+    assert stations == {s: info for s, (_, info) in batched.items() if info is not None}
@@ -0,0 +1,116 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+
+import duckdb
+import httpx
+import pytest
+import respx
+
+from snowfall_analytics.db import WeatherDatabase
+from snowfall_analytics.noaa import NOAAClient
+from snowfall_analytics.pipeline import IngestPipeline, format_stats
+from snowfall_analytics.writer import DatabaseWriter
+
+
+def respond(request: httpx.Request) -> httpx.Response:
+    """Return one row per requested station, or 404 for a missing station"""
+    stations = request.url.params["stations"].split(",")
+    if "MISSING" in stations:
+        return httpx.Response(404)
+    return httpx.Response(
+        200,
+        json=[
+            {
+                "STATION": station_id,
+                "NAME": f"STATION {station_id}",
+                "LATITUDE": "44.8831",
+                "LONGITUDE": "-93.2289",
+                "ELEVATION": "265.8",
+                "DATE": request.url.params["startDate"],
+                "SNOW": "0.5",
+            }
+            for station_id in stations
+        ],
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("use_process_pool", [False, True])
+async def test_pipeline_loads_jobs_and_isolates_failures(
+    tmp_path: Path, use_process_pool: bool
+) -> None:
+    """Test jobs flow through every stage and a failed fetch is only recorded"""
+    db_path = tmp_path / "pipeline.duckdb"
+    jobs = [
+        (["A", "B"], date(2024, 1, 1), date(2024, 1, 31)),
+        (["A", "B"], date(2024, 2, 1), date(2024, 2, 29)),
+        (["MISSING"], date(2024, 1, 1), date(2024, 1, 31)),
+        (["C"], date(2024, 1, 1), date(2024, 1, 31)),
+    ]
+    executor = None if use_process_pool else ThreadPoolExecutor(2)
+
+    with respx.mock() as respx_mock:
+        respx_mock.get("https://www.ncei.noaa.gov/access/services/data/v1").mock(
+            side_effect=respond
+        )
+        async with (
+            NOAAClient(calls_per_minute=6000, max_retries=0) as client,
+            DatabaseWriter(db_path) as writer,
+        ):
+            pipeline = IngestPipeline(client, writer, queue_size=1, executor=executor)
+            result = await pipeline.run(jobs)
+
+    fetch, parse, load = result.stats
+    assert (fetch.items, fetch.failures) == (3, 1)
+    assert (parse.items, parse.rows) == (3, 5)
+    assert (load.items, load.rows) == (3, 5)
+    assert result.failed_jobs == ["MISSING 2024-01-01..2024-01-31"]
+    assert "fetch" in format_stats(result.stats)
+
+    conn = duckdb.connect(str(db_path))
+    try:
+        rows = conn.execute(
+            "SELECT station_id, COUNT(*) FROM weather_data GROUP BY 1 ORDER BY 1"
+        ).fetchall()
+        stations = conn.execute("SELECT COUNT(*) FROM weather_station").fetchone()
+    finally:
+        conn.close()
+    assert rows == [("A", 2), ("B", 2), ("C", 1)]
+    assert stations == (3,)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_records_job_ledger(tmp_path: Path) -> None:
+    """Test finished jobs are marked done so a resume only retries the failures"""
+    db_path = tmp_path / "pipeline.duckdb"
+    jobs = [
+        (["A"], date(2024, 1, 1), date(2024, 1, 31)),
+        (["MISSING"], date(2024, 1, 1), date(2024, 1, 31)),
+        (["B"], date(2024, 1, 1), date(2024, 1, 31)),
+    ]
+    with WeatherDatabase(db_path) as db:
+        db.plan_jobs(jobs)
+
+    with respx.mock() as respx_mock:
+        respx_mock.get("https://www.ncei.noaa.gov/access/services/data/v1").mock(
+            side_effect=respond
+        )
+        async with (
+            NOAAClient(calls_per_minute=6000, max_retries=0) as client,
+            DatabaseWriter(db_path) as writer,
+        ):
+            pipeline = IngestPipeline(client, writer, executor=ThreadPoolExecutor(1))
+            await pipeline.run(jobs)
+
+    with WeatherDatabase(db_path) as db:
+        assert db.get_unfinished_jobs() == [jobs[1]]
+        ledger = db.conn.execute(
+            "SELECT station_ids, status, attempts, response_bytes > 0, error IS NULL "
+            "FROM fetch_job ORDER BY position"
+        ).fetchall()
+    assert ledger == [
+        ("A", "done", 1, True, True),
+        ("MISSING", "failed", 1, False, False),
+        ("B", "done", 1, True, True),
+    ]
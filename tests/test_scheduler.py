@@ -0,0 +1,67 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from snowfall_analytics.scheduler import (
+    StationScheduler,
+    TaskResult,
+    format_summary,
+    oldest_first,
+)
+
+
+@pytest.mark.asyncio
+async def test_run_bounds_in_flight_and_isolates_failures() -> None:
+    """Test the in-flight limit and that one failure doesn't stop the others"""
+    in_flight = 0
+    peak = 0
+    started: list[str] = []
+
+    async def task(name: str) -> None:
+        nonlocal in_flight, peak
+        started.append(name)
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if name == "B":
+            raise ValueError("boom")
+
+    results = await StationScheduler(max_in_flight=2).run(["A", "B", "C", "D", "E"], task)
+
+    assert peak == 2
+    assert started == ["A", "B", "C", "D", "E"]
+    assert [r.name for r in results] == ["A", "B", "C", "D", "E"]
+    assert [r.succeeded for r in results] == [True, False, True, True, True]
+    assert results[1].error == "boom"
+
+
+def test_invalid_max_in_flight() -> None:
+    """Test that at least one task must be allowed in flight"""
+    with pytest.raises(ValueError):
+        StationScheduler(max_in_flight=0)
+
+
+def test_oldest_first() -> None:
+    """Test stations without data come first, then the oldest data"""
+    last_dates = {
+        "RECENT": date(2025, 3, 1),
+        "NEW": None,
+        "OLD": date(1999, 1, 1),
+    }
+
+    assert oldest_first(last_dates) == ["NEW", "OLD", "RECENT"]
+
+
+def test_format_summary() -> None:
+    """Test summary counts and failure details"""
+    summary = format_summary(
+        [
+            TaskResult(name="A", succeeded=True, elapsed=1.5),
+            TaskResult(name="B", succeeded=False, elapsed=0.5, error="timeout"),
+        ]
+    )
+
+    assert "2 total, 1 succeeded, 1 failed" in summary
+    assert "FAILED B after 0.5s: timeout" in summary
@@ -0,0 +1,51 @@
+import json
+from typing import Any, AsyncIterator
+
+import pytest
+
+from snowfall_analytics.streaming import iter_json_array
+
+
+async def chunked(body: bytes, size: int) -> AsyncIterator[bytes]:
+    """Yield a body in fixed size chunks"""
+    for i in range(0, len(body), size):
+        yield body[i : i + size]
+
+
+async def collect(body: bytes, size: int) -> list[Any]:
+    return [element async for element in iter_json_array(chunked(body, size))]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [1, 3, 7, 1024])
+async def test_iter_json_array_chunk_boundaries(size: int) -> None:
+    """Test elements split across chunks, including multi-byte characters"""
+    data = [
+        {"STATION": "USC00041072", "NAME": "BIG BEAR LAKE, CA US", "SNOW": "1.2"},
+        {"NAME": "MÜNCHEN ÉTÉ", "nested": {"values": [1, 2, 3]}},
+        12345,
+        "text, with ] and , inside",
+        [],
+    ]
+    body = json.dumps(data, ensure_ascii=False, indent=2).encode()
+
+    assert await collect(body, size) == data
+
+
+@pytest.mark.asyncio
+async def test_iter_json_array_empty() -> None:
+    """Test empty arrays and empty bodies yield nothing"""
+    assert await collect(b"[]", 1) == []
+    assert await collect(b"  [ ]  ", 1) == []
+    assert await collect(b"", 1) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "body",
+    [b'{"STATION": "X"}', b'[{"a": 1}', b'[{"a": 1} {"b": 2}]', b"[1, 2] trailing"],
+)
+async def test_iter_json_array_invalid(body: bytes) -> None:
+    """Test malformed or truncated bodies raise ValueError"""
+    with pytest.raises(ValueError):
+        await collect(body, 4)
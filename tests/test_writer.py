@@ -0,0 +1,91 @@
+import asyncio
+from decimal import Decimal
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from snowfall_analytics.noaa import weather_data_columns
+from snowfall_analytics.writer import DatabaseWriter
+
+from .conftest import make_data, make_station
+
+
+@pytest.mark.asyncio
+async def test_writer_stores_concurrent_writes(tmp_path: Path) -> None:
+    """Test writes from concurrent producers all land, with backpressure"""
+    db_path = tmp_path / "writer.duckdb"
+
+    async with DatabaseWriter(db_path, max_queue=1) as writer:
+        await asyncio.gather(
+            *(writer.write(make_station(f"S{i}"), make_data(f"S{i}", 10)) for i in range(20))
+        )
+
+    assert writer.rows_written == 200
+    assert 1 <= writer.commits <= 20
+
+    conn = duckdb.connect(str(db_path))
+    try:
+        stations = conn.execute("SELECT COUNT(*) FROM weather_station").fetchone()
+        rows = conn.execute("SELECT COUNT(*) FROM weather_data").fetchone()
+    finally:
+        conn.close()
+    assert stations == (20,)
+    assert rows == (200,)
+
+
+@pytest.mark.asyncio
+async def test_writer_stores_columnar_batches(tmp_path: Path) -> None:
+    """Test columnar batches and record lists are committed together"""
+    db_path = tmp_path / "writer.duckdb"
+
+    async with DatabaseWriter(db_path) as writer:
+        await writer.write_columns(
+            [make_station("A"), make_station("B")],
+            weather_data_columns(make_data("A", 3) + make_data("B", 2)),
+        )
+        await writer.write(None, make_data("C", 4))
+        await writer.write_columns([], weather_data_columns([]))
+
+    assert writer.rows_written == 9
+
+    conn = duckdb.connect(str(db_path))
+    try:
+        rows = conn.execute(
+            "SELECT station_id, COUNT(*), MAX(snowfall) FROM weather_data "
+            "GROUP BY 1 ORDER BY 1"
+        ).fetchall()
+    finally:
+        conn.close()
+    assert rows == [
+        ("A", 3, Decimal("0.5")),
+        ("B", 2, Decimal("0.5")),
+        ("C", 4, Decimal("0.5")),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_writer_reports_failures(tmp_path: Path) -> None:
+    """Test a failed write is re-raised to producers and on close"""
+    writer = DatabaseWriter(tmp_path / "writer.duckdb")
+    writer.start()
+
+    broken = make_station("BROKEN").model_copy(update={"name": None})
+    await writer.write(broken, [])
+    with pytest.raises(RuntimeError, match="Database writer failed"):
+        await writer.flush()
+    assert writer.failed
+
+    with pytest.raises(RuntimeError, match="Database writer failed"):
+        await writer.close()
+    with pytest.raises(RuntimeError):
+        await writer.write(make_station("OK"), [])
+
+
+@pytest.mark.asyncio
+async def test_writer_flush(tmp_path: Path) -> None:
+    """Test flush waits until queued writes are committed"""
+    async with DatabaseWriter(tmp_path / "writer.duckdb") as writer:
+        await writer.write(make_station("S1"), make_data("S1", 10))
+        await writer.flush()
+        assert writer.rows_written == 10